@@ -0,0 +1,258 @@
+'''Headless JSON API over the happiness data, for consumers that do not need the UI.
+
+Serves the same store, indexes, summary cube and OLS coefficients as the app:
+
+	GET /meta                                  factors, regions, countries and years
+	GET /rows?region=&country=&year=           filtered rows, paginated (limit, offset)
+	GET /regions?factor=Life+Ladder&year=2021  regional box statistics (year 0: all years)
+	GET /predictions?country=Finland&country=Chad&factor=Life+Ladder&year=2022&year=2030
+	                                           batch predictions, paginated (limit, offset)
+
+List parameters are repeated. Every response carries an ETag derived from the
+store version and the request, and conditional requests (If-None-Match) get a
+304. Response bodies are kept in a shared in-process LRU, bounded by their
+total size (WORLD_HAPPINESS_API_CACHE_MB), until the store changes.
+
+Run standalone with `python api.py [--port 8502]`, or inside the Streamlit
+process (sharing its loaded data) by setting WORLD_HAPPINESS_API_PORT.
+'''
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import data
+import pipeline
+import prediction
+import summary
+
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+# years the trend model may be asked to predict
+PREDICTION_YEARS = (1900, 2100)
+
+
+class BadRequest(ValueError):
+	pass
+
+
+def _one(query: dict, name: str, default=None):
+	values = query.get(name)
+	return values[-1] if values else default
+
+
+def _int(value, name: str) -> int:
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		raise BadRequest(f'{name} must be an integer') from None
+
+
+def _records(frame) -> str:
+	return frame.to_json(orient='records', double_precision=6)
+
+
+def _page(query: dict) -> tuple:
+	'''(limit, offset) requested in `query`.'''
+	limit = min(_int(_one(query, 'limit', DEFAULT_LIMIT), 'limit'), MAX_LIMIT)
+	offset = _int(_one(query, 'offset', 0), 'offset')
+	# a limit of 0 would hand back next_offset == offset forever
+	if limit < 1:
+		raise BadRequest('limit must be at least 1')
+	if offset < 0:
+		raise BadRequest('offset must not be negative')
+	return limit, offset
+
+
+def _paginated(name: str, records, total: int, limit: int, offset: int) -> str:
+	following = offset + limit if offset + limit < total else None
+	return (f'{{"total":{total},"offset":{offset},"limit":{limit},'
+		f'"next_offset":{json.dumps(following)},"{name}":{_records(records)}}}')
+
+
+def meta(query: dict) -> str:
+	merged_table = data.merged_table()
+	return json.dumps({
+		'version': pipeline.version(),
+		'factors': pipeline.FACTORS,
+		'regions': sorted(merged_table['Region'].unique().astype(str)),
+		'countries': data.merged_index().countries,
+		'years': sorted(int(year) for year in merged_table['year'].unique()),
+	})
+
+
+def rows(query: dict) -> str:
+	index = data.merged_index()
+	table = index.table
+	if 'country' in query:
+		table = index.country(_one(query, 'country'))
+	elif 'region' in query:
+		table = index.region(_one(query, 'region'))
+	elif 'year' in query:
+		table = index.year(_int(_one(query, 'year'), 'year'))
+	# any remaining filters are applied to the (already small) slice
+	if 'region' in query:
+		table = table.loc[table['Region'] == _one(query, 'region')]
+	if 'year' in query:
+		table = table.loc[table['year'] == _int(_one(query, 'year'), 'year')]
+
+	limit, offset = _page(query)
+	return _paginated('rows', table.iloc[offset:offset + limit], len(table), limit, offset)
+
+
+def regions(query: dict) -> str:
+	factor = _one(query, 'factor', 'Life Ladder')
+	if factor not in pipeline.FACTORS:
+		raise BadRequest(f'unknown factor {factor!r}')
+	year = _int(_one(query, 'year', summary.ALL_YEARS), 'year')
+	cube = summary.regional_cube()
+	try:
+		stats = cube.box(factor, year)
+	except KeyError:
+		raise BadRequest(f'no data for year {year}') from None
+	outliers = cube.box_outliers(factor, year)[['Region', 'Country name', 'value']]
+	return f'{{"factor":{json.dumps(factor)},"year":{year},"regions":{_records(stats)},' \
+		f'"outliers":{_records(outliers)}}}'
+
+
+def predictions(query: dict) -> str:
+	model = prediction.trend_model(data.merged_table())
+	countries = query.get('country') or model.countries
+	factors = query.get('factor') or model.factors
+	years = [_int(year, 'year') for year in query.get('year', [])]
+	if not years:
+		raise BadRequest('at least one year is required')
+	first, last = PREDICTION_YEARS
+	if not all(first <= year <= last for year in years):
+		raise BadRequest(f'years must be between {first} and {last}')
+	unknown = [c for c in countries if c not in model.countries] + \
+		[f for f in factors if f not in model.factors]
+	if unknown:
+		raise BadRequest(f'unknown countries or factors: {unknown}')
+
+	# predictions are ordered by country, so only the countries on the page are computed
+	limit, offset = _page(query)
+	block = len(factors) * len(years)
+	total = len(countries) * block
+	first_country = offset // block
+	page_countries = countries[first_country:-(-(offset + limit) // block)]
+	predicted = model.predict(page_countries, factors, years)
+	start = offset - first_country * block
+	return _paginated('predictions', predicted.iloc[start:start + limit], total, limit, offset)
+
+
+ROUTES = {
+	'/meta': meta,
+	'/rows': rows,
+	'/regions': regions,
+	'/predictions': predictions,
+}
+
+
+class ResponseCache:
+	'''Thread-safe LRU of response bodies, evicting by their total size and
+	emptied when the store version changes.'''
+
+	def __init__(self, max_bytes: int):
+		self.max_bytes = max_bytes
+		self.total_bytes = 0
+		self.version = None
+		self._bodies = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, version: str, key, build):
+		with self._lock:
+			if version != self.version:
+				self._bodies.clear()
+				self.total_bytes = 0
+				self.version = version
+			body = self._bodies.get(key)
+			if body is not None:
+				self._bodies.move_to_end(key)
+				return body
+		body = build()
+		with self._lock:
+			if version == self.version and key not in self._bodies and len(body) <= self.max_bytes:
+				self._bodies[key] = body
+				self.total_bytes += len(body)
+				while self.total_bytes > self.max_bytes:
+					_, evicted = self._bodies.popitem(last=False)
+					self.total_bytes -= len(evicted)
+		return body
+
+
+cache = ResponseCache(int(os.environ.get('WORLD_HAPPINESS_API_CACHE_MB', '16')) * 2**20)
+
+
+class Handler(BaseHTTPRequestHandler):
+	server_version = 'WorldHappinessAPI/1.0'
+
+	def do_GET(self):
+		url = urlsplit(self.path)
+		route = ROUTES.get(url.path.rstrip('/') or '/')
+		if route is None:
+			return self._send(404, json.dumps({'error': f'unknown path {url.path}',
+				'paths': sorted(ROUTES)}).encode())
+		query = parse_qs(url.query)
+		key = (url.path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+		version = pipeline.version()
+		etag = '"' + hashlib.sha1(repr((version, key)).encode()).hexdigest()[:20] + '"'
+		if etag in (self.headers.get('If-None-Match') or ''):
+			return self._send(304, b'', etag)
+		try:
+			body = cache.get(version, key, lambda: route(query).encode())
+		except BadRequest as e:
+			return self._send(400, json.dumps({'error': str(e)}).encode())
+		self._send(200, body, etag)
+
+	def _send(self, status: int, body: bytes, etag: str = None):
+		self.send_response(status)
+		if etag:
+			self.send_header('ETag', etag)
+			self.send_header('Cache-Control', 'no-cache')
+		if status != 304:
+			self.send_header('Content-Type', 'application/json')
+			self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		if status != 304:
+			self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+def serve(port: int, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+	server = ThreadingHTTPServer((host, port), Handler)
+	server.daemon_threads = True
+	return server
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def serve_in_background():
+	'''Start the API on WORLD_HAPPINESS_API_PORT in a daemon thread, once per process.'''
+	global _background
+	port = os.environ.get('WORLD_HAPPINESS_API_PORT')
+	if not port or _background is not None:
+		return
+	with _background_lock:
+		if _background is None:
+			_background = serve(int(port))
+			threading.Thread(target=_background.serve_forever, name='happiness-api',
+				daemon=True).start()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--host', default='0.0.0.0')
+	parser.add_argument('--port', type=int, default=8502)
+	args = parser.parse_args()
+	print(f'serving on http://{args.host}:{args.port}')
+	serve(args.port, args.host).serve_forever()
@@ -0,0 +1,97 @@
+'''Lottie animations shown on the Abstract and Conclusion pages.
+
+The animation JSON is read from assets/lottie and served from an in-memory
+cache, so pages never touch the network while rendering; a page whose file is
+missing renders without its animation. The files are fetched (and refreshed)
+from lottiefiles.com with a pooled, timeout-bounded session: once from the
+command line (python assets.py), or periodically in a background thread when
+WORLD_HAPPINESS_LOTTIE_REFRESH is set to an interval in seconds.
+'''
+import json
+import os
+import tempfile
+import threading
+import time
+
+import profiling
+
+
+LOTTIE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'lottie')
+
+ANIMATIONS = {
+	'abstract': 'https://assets5.lottiefiles.com/packages/lf20_u8jppxsl.json',
+	'conclusion': 'https://assets6.lottiefiles.com/packages/lf20_qp1q7mct.json',
+}
+
+_cache = {}
+_lock = threading.Lock()
+_refresher = None
+
+
+def _path(name: str) -> str:
+	return os.path.join(LOTTIE_DIR, name + '.json')
+
+
+def lottie(name: str):
+	'''The parsed animation `name`, or None when no local copy exists.'''
+	_start_background_refresh()
+	if name in _cache:
+		return _cache[name]
+	with _lock:
+		if name not in _cache:
+			try:
+				with profiling.section(f'lottie {name}'), open(_path(name)) as f:
+					_cache[name] = json.load(f)
+			except (OSError, ValueError):
+				_cache[name] = None
+		return _cache[name]
+
+
+def refresh(names=None, timeout: float = 5.0) -> dict:
+	'''Download fresh copies of the animations, replacing the vendored files.
+
+	Returns {name: error message} for the ones that could not be fetched;
+	their previous copy is kept.'''
+	import requests
+
+	errors = {}
+	os.makedirs(LOTTIE_DIR, exist_ok=True)
+	with requests.Session() as session:
+		for name in names or ANIMATIONS:
+			try:
+				r = session.get(ANIMATIONS[name], timeout=timeout)
+				r.raise_for_status()
+				animation = r.json()
+			except (requests.RequestException, ValueError) as e:
+				errors[name] = str(e)
+				continue
+			fd, tmp = tempfile.mkstemp(dir=LOTTIE_DIR, suffix='.tmp')
+			with os.fdopen(fd, 'w') as f:
+				json.dump(animation, f, separators=(',', ':'))
+			os.replace(tmp, _path(name))
+			with _lock:
+				_cache[name] = animation
+	return errors
+
+
+def _refresh_loop(interval: float):
+	while True:
+		refresh()
+		time.sleep(interval)
+
+
+def _start_background_refresh():
+	global _refresher
+	interval = os.environ.get('WORLD_HAPPINESS_LOTTIE_REFRESH')
+	if not interval or _refresher is not None:
+		return
+	with _lock:
+		if _refresher is None:
+			_refresher = threading.Thread(target=_refresh_loop, args=(float(interval),),
+				name='lottie-refresh', daemon=True)
+			_refresher.start()
+
+
+if __name__ == '__main__':
+	for name, error in refresh().items():
+		print(f'{name}: {error}')
@@ -0,0 +1,33 @@
+'''Headless driver for main2.py built on Streamlit's testing harness.
+
+The option_menu sidebar is a custom component, which AppTest cannot click, so
+it is replaced by a function returning the page under test, read from each
+session's own state so concurrent sessions can sit on different pages.
+Needs a Streamlit release that ships streamlit.testing (1.28 or later).
+'''
+import os
+
+import streamlit_option_menu
+from streamlit.testing.v1 import AppTest
+
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main2.py')
+
+PAGES = ['Abstract', 'Background Information', 'Data Cleaning', 'Familiarizing with Data',
+	'Exploratory Analysis', 'Data Analysis', 'Conclusion', 'Bibliography']
+
+
+def _option_menu(*args, **kwargs):
+	import streamlit as st
+
+	return st.session_state.get('_apptest_page', PAGES[0])
+
+
+streamlit_option_menu.option_menu = _option_menu
+
+
+def app_test(page: str, timeout: float = 120) -> AppTest:
+	'''An AppTest session of main2.py whose sidebar has `page` selected.'''
+	at = AppTest.from_file(APP, default_timeout=timeout)
+	at.session_state['_apptest_page'] = page
+	return at
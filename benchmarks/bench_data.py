@@ -0,0 +1,51 @@
+'''Cold vs warm load times of the shared dataset layer, CSV vs the compact store.
+
+Run from the repository root:  python -m benchmarks.bench_data
+'''
+import os
+import statistics
+import time
+
+import pandas as pd
+
+import data
+import pipeline
+
+
+TABLES = [
+	(data.MERGED_TABLE, pd.read_csv),
+	(data.ANIMATION_TABLE, pd.read_csv),
+	(data.REPORT, pd.read_csv),
+	(data.REPORT_2021, pd.read_csv),
+	(pipeline.MERGED_STORE, pipeline.read_store),
+	(pipeline.ANIMATION_STORE, pipeline.read_store),
+]
+
+
+def timed(fn, repeat):
+	samples = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		samples.append((time.perf_counter() - start) * 1000)
+	return statistics.median(samples)
+
+
+def main(repeat=20):
+	pipeline.build()
+	print(f'{"table":<36}{"size KB":>10}{"cold ms":>12}{"warm ms":>12}')
+	for name, reader in TABLES:
+		path = os.path.join(data.DATA_DIR, name)
+
+		def cold():
+			data.clear_cache()
+			data.load_table(path, reader)
+		cold_ms = timed(cold, repeat)
+		data.load_table(path, reader)
+		warm_ms = timed(lambda: data.load_table(path, reader), repeat)
+		size = os.path.getsize(path) / 1024
+		print(f'{os.path.relpath(path, data.DATA_DIR):<36}{size:>10.1f}{cold_ms:>12.3f}{warm_ms:>12.4f}')
+
+
+if __name__ == '__main__':
+	main()
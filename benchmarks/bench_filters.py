@@ -0,0 +1,71 @@
+'''Per-rerun filter latency: boolean masks vs the precomputed TableIndex.
+
+The merged table is grown synthetically, by repeating it as extra report years
+and by adding sub-national rows (copies of each country under a new name), to
+show how each approach scales with the data.
+
+Run from the repository root:  python -m benchmarks.bench_filters
+'''
+import statistics
+import time
+
+import pandas as pd
+
+import data
+import indexes
+
+
+def timed(fn, repeat=50):
+	samples = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		samples.append((time.perf_counter() - start) * 1000)
+	return statistics.median(samples)
+
+
+def grow(table, years=1, subnational=1):
+	'''Repeat `table` as `years` times as many report years, then add
+	`subnational - 1` sub-national copies of every row.'''
+	span = int(table['year'].max() - table['year'].min() + 1)
+	frames = []
+	for i in range(years):
+		frame = table.copy()
+		frame['year'] = frame['year'].astype(int) + i * span
+		frames.append(frame)
+	grown = pd.concat(frames, ignore_index=True)
+	frames = [grown]
+	for i in range(1, subnational):
+		frame = grown.copy()
+		frame['Country name'] = frame['Country name'].astype(str) + f' / {i}'
+		frames.append(frame)
+	grown = pd.concat(frames, ignore_index=True)
+	grown['Country name'] = grown['Country name'].astype('category')
+	return grown
+
+
+def main():
+	merged_table = data.merged_table()
+	regional = ['Central and Eastern Europe', 'Western Europe', 'South Asia']
+	print(f'{"rows":>8}{"index build ms":>16}  {"filter":<10}{"mask ms":>10}{"index ms":>10}')
+	for years, subnational in [(1, 1), (4, 1), (4, 4), (16, 4)]:
+		table = grow(merged_table, years, subnational)
+		build_ms = timed(lambda: indexes.TableIndex(table), repeat=3)
+		index = indexes.TableIndex(table)
+		cases = [
+			('region', lambda: table.loc[table['Region'] == 'South Asia'],
+				lambda: index.region('South Asia')),
+			('country', lambda: table.loc[table['Country name'] == 'Finland'],
+				lambda: index.country('Finland')),
+			('year', lambda: table.loc[table['year'] == 2021],
+				lambda: index.year(2021)),
+			('regions', lambda: table.loc[table['Region'].isin(regional)],
+				lambda: index.regions(regional)),
+		]
+		for i, (name, mask, indexed) in enumerate(cases):
+			prefix = f'{len(table):>8}{build_ms:>16.2f}' if i == 0 else ' ' * 24
+			print(f'{prefix}  {name:<10}{timed(mask):>10.3f}{timed(indexed):>10.3f}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,43 @@
+'''Peak memory of streaming ingestion as raw reports grow.
+
+Synthetic reports of increasing size (the 2005-2020 panel repeated under
+new country names, standing in for sub-national extracts) are streamed into a
+part file. Peak Python heap should stay flat once reports exceed one chunk.
+
+Run from the repository root:  python -m benchmarks.bench_ingest
+'''
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+import pipeline
+
+
+def synthetic_report(path: str, copies: int) -> None:
+	panel = pd.read_csv(os.path.join(pipeline.DATA_DIR, pipeline.REPORT), encoding='utf-8-sig')
+	for i in range(copies):
+		frame = panel.assign(**{'Country name': panel['Country name'] + f' / {i}'})
+		frame.to_csv(path, mode='a' if i else 'w', header=not i, index=False)
+
+
+def main():
+	print(f'{"rows":>10}{"CSV MB":>10}{"ingest s":>10}{"peak heap MB":>14}')
+	with tempfile.TemporaryDirectory() as tmp:
+		source, part = os.path.join(tmp, 'report.csv'), os.path.join(tmp, 'part.feather')
+		for copies in [1, 10, 100, 400]:
+			synthetic_report(source, copies)
+			tracemalloc.start()
+			start = time.perf_counter()
+			rows = pipeline.ingest(source, part)
+			elapsed = time.perf_counter() - start
+			_, peak = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+			print(f'{rows:>10}{os.path.getsize(source) / 2**20:>10.1f}{elapsed:>10.2f}'
+				f'{peak / 2**20:>14.1f}')
+
+
+if __name__ == '__main__':
+	main()
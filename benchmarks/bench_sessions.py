@@ -0,0 +1,198 @@
+'''Concurrent-session load benchmark for main2.py.
+
+Many headless sessions (Streamlit's AppTest harness) are driven at once: each
+opens a page and then, on 'Data Analysis', walks through a sequence of widget
+changes, and every rerun is timed. AppTest sessions are not thread-safe, so
+concurrency comes from a pool of worker processes, each serving sessions one
+after another with its process-wide caches kept warm, as a dyno would.
+
+Reported per scenario step: p50/p95 rerun latency. Overall: throughput
+(reruns/s) and, per session, the worker's peak RSS while serving it and how
+far that peak rose above the RSS the session started with. The peak is reset
+(/proc/self/clear_refs) at the start of every session, so it is not carried
+over from earlier sessions of the same worker; this needs Linux. Results are
+saved as JSON (with the git revision) so runs can be compared:
+
+	python -m benchmarks.bench_sessions --sessions 16 --concurrency 4
+	python -m benchmarks.bench_sessions --compare benchmarks/results/<earlier>.json
+'''
+import argparse
+import json
+import os
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pipeline
+from benchmarks.apptest import PAGES, app_test
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+FACTORS = ['Healthy life expectancy at birth', 'Life Ladder', 'Social support', 'Generosity',
+	'Log GDP per capita', 'Perceptions of corruption', 'Freedom to make life choices']
+REGIONS = ['Central and Eastern Europe', 'Commonwealth of Independent States', 'South Asia',
+	'Middle East and North Africa', 'Latin America and Caribbean', 'North America and ANZ',
+	'Western Europe', 'Sub-Saharan Africa', 'Southeast Asia', 'East Asia']
+FACTOR_LABEL = 'Select the happiness factor you would like to evaluate'
+
+
+def _selectbox(at, label, nth=0):
+	return [w for w in at.selectbox if w.label == label or w.label.startswith(label)][nth]
+
+
+def analysis_steps(rng: random.Random) -> list:
+	'''(step name, action) pairs for one session of the Data Analysis page.'''
+	return [
+		('region', lambda at: _selectbox(at, 'Select the region').set_value(rng.choice(REGIONS))),
+		('scatter factors', lambda at: (
+			_selectbox(at, 'Select the first happiness factor').set_value(rng.choice(FACTORS)),
+			_selectbox(at, 'Select the second happiness factor').set_value(rng.choice(FACTORS)))),
+		('scatter format', lambda at: _selectbox(at, 'Select the format of display')
+			.set_value(rng.choice(['Region', 'Country name']))),
+		('choropleth factor', lambda at: _selectbox(at, FACTOR_LABEL, 1).set_value(rng.choice(FACTORS))),
+		('line checkboxes', lambda at: [box.check() for box in rng.sample(list(at.checkbox), 3)]),
+		('line factor', lambda at: _selectbox(at, FACTOR_LABEL, 2).set_value(rng.choice(FACTORS))),
+		('prediction', lambda at: at.button[0].click()),
+	]
+
+
+def _timed_run(at, step: str) -> tuple:
+	'''(step, ms) for one rerun of `at`, failing if the rerun raised.'''
+	start = time.perf_counter()
+	at.run()
+	elapsed_ms = (time.perf_counter() - start) * 1000
+	# a later successful rerun clears at.exception, so it is checked after every one
+	if at.exception:
+		raise RuntimeError(f'{step}: {at.exception[0].value}')
+	return step, elapsed_ms
+
+
+def _status_mb(field: str) -> float:
+	'''A memory field (VmRSS, VmHWM) of /proc/self/status, in MB.'''
+	with open('/proc/self/status') as f:
+		for line in f:
+			if line.startswith(field + ':'):
+				return int(line.split()[1]) / 1024
+	raise RuntimeError(f'{field} not in /proc/self/status')
+
+
+def _reset_peak_rss() -> None:
+	'''Make VmHWM (peak RSS) restart from the current RSS.'''
+	with open('/proc/self/clear_refs', 'w') as f:
+		f.write('5')
+
+
+def run_session(page: str, seed: int):
+	'''([(step, ms)], (peak RSS MB, peak RSS growth MB)) for one session: the
+	first paint of `page`, then its widget steps.'''
+	rng = random.Random(seed)
+	start_rss = _status_mb('VmRSS')
+	_reset_peak_rss()
+	at = app_test(page)
+	timings = [_timed_run(at, f'{page}: first paint')]
+	if page == 'Data Analysis':
+		for step, action in analysis_steps(rng):
+			action(at)
+			timings.append(_timed_run(at, f'{page}: {step}'))
+	peak_rss = _status_mb('VmHWM')
+	return timings, (peak_rss, peak_rss - start_rss)
+
+
+def _git_revision() -> str:
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+			text=True, check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return 'unknown'
+
+
+def run(sessions: int, concurrency: int, seed: int = 0) -> dict:
+	# half of the sessions open Data Analysis, the rest spread over the other pages
+	others = [page for page in PAGES if page != 'Data Analysis']
+	pages = ['Data Analysis' if i % 2 == 0 else others[(i // 2) % len(others)]
+		for i in range(sessions)]
+
+	# build the store up front so that no first paint includes (or races) a store build
+	pipeline.build()
+
+	start = time.perf_counter()
+	with ProcessPoolExecutor(max_workers=concurrency) as pool:
+		sessions_out = list(pool.map(run_session, pages, [seed + i for i in range(sessions)]))
+	wall = time.perf_counter() - start
+	results = [timings for timings, _ in sessions_out]
+	peak_rss = [rss for _, (rss, _) in sessions_out]
+	rss_growth = [growth for _, (_, growth) in sessions_out]
+
+	by_step = {}
+	for timings in results:
+		for step, ms in timings:
+			by_step.setdefault(step, []).append(ms)
+	reruns = sum(len(timings) for timings in results)
+	return {
+		'revision': _git_revision(),
+		'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'sessions': sessions,
+		'concurrency': concurrency,
+		'throughput_reruns_per_s': reruns / wall,
+		'session_peak_rss_mb_max': max(peak_rss),
+		'session_peak_rss_mb_mean': float(np.mean(peak_rss)),
+		'session_rss_growth_mb_max': max(rss_growth),
+		'session_rss_growth_mb_mean': float(np.mean(rss_growth)),
+		'steps': {step: {'n': len(ms), 'p50_ms': float(np.percentile(ms, 50)),
+			'p95_ms': float(np.percentile(ms, 95))} for step, ms in sorted(by_step.items())},
+	}
+
+
+def report(result: dict, baseline: dict = None) -> None:
+	print(f'{result["sessions"]} sessions, {result["concurrency"]} concurrent, '
+		f'revision {result["revision"]}')
+	header = f'{"step":<44}{"n":>5}{"p50 ms":>10}{"p95 ms":>10}'
+	print(header + (f'{"p50 Δ%":>10}{"p95 Δ%":>10}' if baseline else ''))
+	for step, stats in result['steps'].items():
+		line = f'{step:<44}{stats["n"]:>5}{stats["p50_ms"]:>10.1f}{stats["p95_ms"]:>10.1f}'
+		old = (baseline or {}).get('steps', {}).get(step)
+		if old:
+			line += (f'{100 * (stats["p50_ms"] / old["p50_ms"] - 1):>+10.1f}'
+				f'{100 * (stats["p95_ms"] / old["p95_ms"] - 1):>+10.1f}')
+		print(line)
+	print(f'throughput {result["throughput_reruns_per_s"]:.2f} reruns/s')
+	print(f'peak RSS per session {result["session_peak_rss_mb_max"]:.0f} MB max, '
+		f'{result["session_peak_rss_mb_mean"]:.0f} MB mean; growth over the session\'s '
+		f'starting RSS {result["session_rss_growth_mb_max"]:.0f} MB max, '
+		f'{result["session_rss_growth_mb_mean"]:.0f} MB mean')
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--sessions', type=int, default=16)
+	parser.add_argument('--concurrency', type=int, default=4)
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--compare', help='earlier results JSON to diff against')
+	parser.add_argument('--out', help='where to save the results JSON '
+		'(default: benchmarks/results/<time>-<revision>.json)')
+	args = parser.parse_args()
+
+	result = run(args.sessions, args.concurrency, args.seed)
+	baseline = None
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+	report(result, baseline)
+
+	out = args.out or os.path.join(RESULTS_DIR,
+		f'{result["time"].replace(":", "")}-{result["revision"]}.json')
+	os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+	with open(out, 'w') as f:
+		json.dump(result, f, indent=1)
+	print(f'saved {out}')
+
+
+if __name__ == '__main__':
+	# run through the importable module: AppTest replaces sys.modules['__main__'] in the
+	# workers, so functions pickled as __main__.* could not be found there
+	from benchmarks import bench_sessions
+	bench_sessions.main()
@@ -0,0 +1,69 @@
+'''Cold-start cost of every page: module import time and first-paint time.
+
+Each measurement runs in a fresh interpreter, as on a newly booted dyno.
+"import" is the time to import the page module (and everything it pulls in)
+once streamlit itself is loaded; "first paint" is the first full script run
+of main2.py with that page selected, through Streamlit's testing harness.
+
+Run from the repository root:  python -m benchmarks.bench_startup [--json out.json]
+'''
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.apptest import PAGES
+
+
+IMPORT_SNIPPET = '''
+import time, streamlit
+import views
+start = time.perf_counter()
+views.load({page!r})
+print((time.perf_counter() - start) * 1000)
+'''
+
+PAINT_SNIPPET = '''
+import time
+from benchmarks.apptest import app_test
+at = app_test({page!r})
+start = time.perf_counter()
+at.run()
+assert not at.exception, [e.value for e in at.exception]
+print((time.perf_counter() - start) * 1000)
+'''
+
+
+def measure(snippet: str, page: str):
+	'''Milliseconds reported by `snippet`, or None (with the error shown) if it failed.'''
+	out = subprocess.run([sys.executable, '-c', snippet.format(page=page)],
+		capture_output=True, text=True)
+	if out.returncode != 0:
+		print(f'{page}: {out.stderr.strip().splitlines()[-1]}', file=sys.stderr)
+		return None
+	return float(out.stdout.strip().splitlines()[-1])
+
+
+def _ms(value) -> str:
+	return 'failed' if value is None else f'{value:.1f}'
+
+
+def main():
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--json', help='also write the results to this file')
+	args = parser.parse_args()
+
+	results = []
+	print(f'{"page":<28}{"import ms":>12}{"first paint ms":>16}')
+	for page in PAGES:
+		import_ms = measure(IMPORT_SNIPPET, page)
+		paint_ms = measure(PAINT_SNIPPET, page)
+		results.append({'page': page, 'import_ms': import_ms, 'first_paint_ms': paint_ms})
+		print(f'{page:<28}{_ms(import_ms):>12}{_ms(paint_ms):>16}')
+	if args.json:
+		with open(args.json, 'w') as f:
+			json.dump(results, f, indent=1)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,90 @@
+import functools
+import os
+import threading
+
+import pandas as pd
+
+import pipeline
+import profiling
+
+
+DATA_DIR = pipeline.DATA_DIR
+
+MERGED_TABLE = 'world_happiness2.csv'
+ANIMATION_TABLE = 'animation_frame1'
+REPORT = pipeline.REPORT
+REPORT_2021 = pipeline.REPORT_2021
+
+# process-wide cache shared by every session: path -> (mtime, frame)
+_cache = {}
+_lock = threading.Lock()
+
+
+def load_table(name: str, reader=pd.read_csv) -> pd.DataFrame:
+	'''Return the table stored in `name`, reading it at most once per file version.
+
+	The frame is shared across sessions, so callers must treat it as read-only
+	(take a .copy() before mutating it).'''
+	path = os.path.join(DATA_DIR, name)
+	mtime = os.stat(path).st_mtime_ns
+	entry = _cache.get(path)
+	if entry is not None and entry[0] == mtime:
+		return entry[1]
+	with _lock:
+		# another session may have loaded it while we waited for the lock
+		entry = _cache.get(path)
+		if entry is not None and entry[0] == mtime:
+			return entry[1]
+		with profiling.section(f'read {os.path.basename(path)}'):
+			frame = reader(path)
+		_cache[path] = (mtime, frame)
+		return frame
+
+
+def clear_cache() -> None:
+	with _lock:
+		_cache.clear()
+
+
+def per_table(build):
+	'''Decorator sharing build(table) between sessions, recomputed only when a new
+	version of the table is loaded (load_table returns the same object until then).'''
+	lock = threading.Lock()
+	latest = None  # (table, result)
+
+	@functools.wraps(build)
+	def cached(table: pd.DataFrame):
+		nonlocal latest
+		entry = latest
+		if entry is not None and entry[0] is table:
+			return entry[1]
+		with lock:
+			if latest is None or latest[0] is not table:
+				latest = (table, build(table))
+			return latest[1]
+	return cached
+
+
+def merged_table() -> pd.DataFrame:
+	pipeline.build()
+	return load_table(pipeline.MERGED_STORE, pipeline.read_store)
+
+
+def merged_index():
+	# indexes uses per_table, so it is imported here rather than at the top
+	import indexes
+
+	return indexes.table_index(merged_table())
+
+
+def animation_table() -> pd.DataFrame:
+	pipeline.build()
+	return load_table(pipeline.ANIMATION_STORE, pipeline.read_store)
+
+
+def report() -> pd.DataFrame:
+	return load_table(REPORT)
+
+
+def report_2021() -> pd.DataFrame:
+	return load_table(REPORT_2021)
@@ -0,0 +1,267 @@
+'''Figure building and caching for the heavy charts of the Data Analysis page.
+
+Built figures are kept in a process-wide LRU keyed by the widget options that
+produced them (plus the store version), bounded by the total size of their
+serialized payloads. `compact` rewrites a figure so that animation frames only
+carry what changes between frames, with metrics rounded (and float32 where
+plotly ships typed arrays). The multi-country line chart can be packed into a
+single WebGL trace and downsampled so its size stays bounded.
+'''
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import plotly
+
+import profiling
+
+
+FigureStats = namedtuple('FigureStats', 'name build_ms payload_bytes hit')
+
+# axis ranges of the animated scatter, per happiness factor
+FACTOR_RANGES = {
+	'Healthy life expectancy at birth': [0, 80],
+	'Life Ladder': [0, 10],
+	'Social support': [0, 1],
+	'Generosity': [-0.5, 1],
+	'Log GDP per capita': [6, 12],
+	'Perceptions of corruption': [0, 1],
+	'Freedom to make life choices': [0, 1],
+}
+
+# plotly >= 6 serializes numpy arrays as typed arrays, where float32 halves the bytes
+_TYPED_ARRAYS = int(plotly.__version__.split('.')[0]) >= 6
+
+
+class FigureCache:
+	'''Thread-safe LRU of built figures, evicting by serialized payload size.'''
+
+	def __init__(self, max_bytes: int):
+		self.max_bytes = max_bytes
+		self.total_bytes = 0
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+
+	def __len__(self):
+		return len(self._entries)
+
+	def get(self, key, build):
+		'''Return (figure, FigureStats) for `key`, calling build() on a miss.
+
+		Cached figures are shared by every session and must not be mutated.'''
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None:
+				self._entries.move_to_end(key)
+				fig, stats = entry
+				return fig, stats._replace(build_ms=0.0, hit=True)
+
+		start = time.perf_counter()
+		with profiling.section(f'build {key[0]}'):
+			fig = build()
+		build_ms = (time.perf_counter() - start) * 1000
+		with profiling.section(f'serialize {key[0]}'):
+			payload_bytes = len(fig.to_json())
+		stats = FigureStats(key[0], build_ms, payload_bytes, False)
+
+		with self._lock:
+			if key not in self._entries:
+				self._entries[key] = (fig, stats)
+				self.total_bytes += stats.payload_bytes
+			while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+				_, (_, evicted) = self._entries.popitem(last=False)
+				self.total_bytes -= evicted.payload_bytes
+		return fig, stats
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self.total_bytes = 0
+
+
+cache = FigureCache(int(os.environ.get('WORLD_HAPPINESS_FIGURE_CACHE_MB', '64')) * 2**20)
+
+
+def _pack(values, decimals):
+	values = np.asarray(values)
+	if values.dtype.kind != 'f':
+		return values
+	values = values.astype(np.float64).round(decimals)
+	return values.astype(np.float32) if _TYPED_ARRAYS else values
+
+
+def _constant(traces: list) -> dict:
+	'''The scalar attributes (nested dicts included) that have the same value in every trace.'''
+	constant = {}
+	for key, value in traces[0].items():
+		values = [trace.get(key) for trace in traces]
+		if isinstance(value, dict) and all(isinstance(v, dict) for v in values):
+			inner = _constant(values)
+			if inner:
+				constant[key] = inner
+		elif isinstance(value, (str, int, float, bool)) and all(v == value for v in values):
+			constant[key] = value
+	return constant
+
+
+def _strip(trace: dict, constant: dict) -> dict:
+	'''Drop the attributes of a frame trace that never change.
+
+	Plotly.animate merges a frame onto the trace as the previous frame left it,
+	not onto the base trace, so only attributes equal in the base and in every
+	frame can be left out: a value shared with the base but changed by another
+	frame would otherwise never be restored.'''
+	stripped = {}
+	for key, value in trace.items():
+		if key == 'type':
+			stripped[key] = value
+		elif isinstance(value, dict):
+			inner = _strip(value, constant.get(key) or {})
+			if inner:
+				stripped[key] = inner
+		elif key not in constant:
+			stripped[key] = value
+	return stripped
+
+
+def compact(fig, decimals: int = 3):
+	'''Round data arrays and strip the attributes no animation frame changes.'''
+	import plotly.graph_objects as go
+
+	traces = list(fig.data) + [trace for frame in fig.frames for trace in frame.data]
+	for trace in traces:
+		for attr in ('x', 'y', 'z'):
+			if attr in trace and trace[attr] is not None:
+				trace[attr] = _pack(trace[attr], decimals)
+
+	base = [trace.to_plotly_json() for trace in fig.data]
+	frame_traces = [[trace.to_plotly_json() for trace in frame.data] for frame in fig.frames]
+	constant = [_constant([trace] + [traces[i] for traces in frame_traces if i < len(traces)])
+		for i, trace in enumerate(base)]
+	frames = []
+	for frame, traces in zip(fig.frames, frame_traces):
+		data = [_strip(trace, constant[i] if i < len(constant) else {})
+			for i, trace in enumerate(traces)]
+		frames.append(go.Frame(data=data, name=frame.name, traces=frame.traces))
+	fig.frames = frames
+	return fig
+
+
+def animated_scatter(table, x: str, y: str, group: str, compact_frames: bool = True):
+	import plotly.express as px
+
+	fig = px.scatter(table, x= x, y= y,
+		animation_frame="year", animation_group= group ,category_orders = {'year':np.arange(2005, 2022)},
+		color="Region", hover_name="Country name", size = 'year',
+		range_x = FACTOR_RANGES.get(x), range_y = FACTOR_RANGES.get(y),
+		size_max=12, width = 800, height = 500)
+	return compact(fig) if compact_frames else fig
+
+
+def choropleth(table, factor: str, compact_frames: bool = True):
+	import plotly.express as px
+
+	fig = px.choropleth(table, locations = 'Country name', locationmode = 'country names',
+		color = factor, animation_frame = 'year',
+		category_orders = {'year':np.arange(2005, 2022)},
+		projection = 'orthographic', color_continuous_scale = px.colors.sequential.RdBu, height = 600,
+		hover_name = 'Country name')
+	return compact(fig) if compact_frames else fig
+
+
+# the line chart switches to a single packed WebGL trace above this many countries
+LINE_PACK_THRESHOLD = 30
+# and is downsampled above this many points
+LINE_MAX_POINTS = 4000
+
+LINE_OVERLAYS = ('None', 'Regional mean', 'Percentile band')
+
+
+def downsample(table, max_points: int = LINE_MAX_POINTS):
+	'''Keep every k-th year of each country (and always its last one) so that at
+	most about `max_points` rows remain, in their original order.'''
+	if len(table) <= max_points:
+		return table
+	step = -(-len(table) // max_points)
+	years = table.groupby('Country name', observed=True)['year']
+	rank = years.rank(method='first').to_numpy(dtype=np.int64) - 1
+	size = years.transform('size').to_numpy()
+	return table.loc[(rank % step == 0) | (rank == size - 1)]
+
+
+def packed_lines(table, factor: str, max_points: int = LINE_MAX_POINTS, **layout):
+	'''Every country's line in one Scattergl trace, separated by NaN gaps, with
+	the country name carried per point for the hover label.'''
+	import plotly.graph_objects as go
+
+	table = downsample(table.sort_values(['Country name', 'year'], kind='stable'), max_points)
+	names = table['Country name'].astype(str).to_numpy()
+	x = _pack(table['year'].to_numpy(dtype=np.float64), 0)
+	y = _pack(table[factor].to_numpy(), 3)
+	# insert a NaN point before every change of country to break the line there
+	breaks = np.flatnonzero(names[1:] != names[:-1]) + 1
+	x = np.insert(x, breaks, np.nan)
+	y = np.insert(y, breaks, np.nan)
+	names = np.insert(names.astype(object), breaks, None)
+
+	fig = go.Figure(go.Scattergl(x=x, y=y, customdata=names, mode='lines',
+		line=dict(width=1, color='rgba(99, 110, 250, 0.45)'), name='Countries',
+		hovertemplate='<b>%{customdata}</b><br>year=%{x}<br>' + factor + '=%{y}<extra></extra>'))
+	fig.update_layout(xaxis_title='year', yaxis_title=factor, **layout)
+	return fig
+
+
+def add_overlay(fig, table, factor: str, overlay: str):
+	'''Draw regional means or a 10th-90th percentile band over a line chart.'''
+	if overlay == 'Regional mean':
+		means = (table.groupby(['Region', 'year'], observed=True)[factor].mean()
+			.reset_index())
+		for region, group in means.groupby('Region', observed=True):
+			fig.add_scatter(x=group['year'], y=group[factor], mode='lines',
+				line=dict(width=3, dash='dash'), name=f'{region} (mean)')
+	elif overlay == 'Percentile band':
+		band = table.groupby('year')[factor].quantile([0.1, 0.5, 0.9]).unstack()
+		fig.add_scatter(x=band.index, y=band[0.1], mode='lines', line_width=0,
+			showlegend=False, hoverinfo='skip')
+		fig.add_scatter(x=band.index, y=band[0.9], mode='lines', line_width=0, fill='tonexty',
+			fillcolor='rgba(239, 85, 59, 0.2)', name='10th-90th percentile')
+		fig.add_scatter(x=band.index, y=band[0.5], mode='lines', line=dict(width=3, color='#EF553B'),
+			name='median')
+	return fig
+
+
+def line_chart(table, factor: str, overlay: str = 'None', pack=None,
+		max_points: int = LINE_MAX_POINTS, **layout):
+	'''One line per country, packed into a single WebGL trace when there are many,
+	and downsampled above `max_points` either way. Overlays use every row.'''
+	import plotly.express as px
+
+	if pack is None:
+		pack = table['Country name'].nunique() > LINE_PACK_THRESHOLD
+	if pack:
+		fig = packed_lines(table, factor, max_points, **layout)
+	else:
+		fig = px.line(downsample(table, max_points), y = factor, color = 'Country name', x= 'year',
+			**layout)
+	return add_overlay(fig, table, factor, overlay)
+
+
+def debug_enabled() -> bool:
+	return os.environ.get('WORLD_HAPPINESS_DEBUG', '') not in ('', '0')
+
+
+def debug_panel(records: list):
+	'''Build time and payload size of each cached chart drawn in this rerun,
+	followed by the time every chart took in it.'''
+	import streamlit as st
+
+	import memo
+
+	with st.expander('Figure cache debug'):
+		st.table([{'chart': r.name, 'cache hit': r.hit, 'build ms': round(r.build_ms, 1),
+			'payload KB': round(r.payload_bytes / 1024, 1)} for r in records])
+		st.caption(f'{len(cache)} cached figures, {cache.total_bytes / 2**20:.1f} MB '
+			f'of {cache.max_bytes / 2**20:.0f} MB')
+		st.table(memo.timings())
@@ -0,0 +1,58 @@
+'''Precomputed row offsets for the Data Analysis filters.
+
+The merged table is sorted once so that every region, every country and every
+year occupies one contiguous block of rows. A filter then becomes a dict lookup
+plus an .iloc slice, which pandas returns as a view instead of scanning and
+copying the whole table on each rerun.
+'''
+import numpy as np
+import pandas as pd
+
+import data
+
+
+def _blocks(keys: np.ndarray) -> dict:
+	'''Map each value of an already grouped array to the slice of rows holding it.'''
+	if len(keys) == 0:
+		return {}
+	starts = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+	starts = np.concatenate([[0], starts])
+	stops = np.concatenate([starts[1:], [len(keys)]])
+	return {keys[start]: slice(start, stop) for start, stop in zip(starts, stops)}
+
+
+class TableIndex:
+	'''Region, country and year blocks over one version of the merged table.'''
+
+	def __init__(self, table: pd.DataFrame):
+		self.table = table.sort_values(['Region', 'Country name', 'year'],
+			kind='stable').reset_index(drop=True)
+		self.by_year = self.table.sort_values('year', kind='stable').reset_index(drop=True)
+		self._regions = _blocks(self.table['Region'].to_numpy(dtype=object))
+		self._countries = _blocks(self.table['Country name'].to_numpy(dtype=object))
+		self._years = _blocks(self.by_year['year'].to_numpy())
+
+	@property
+	def countries(self) -> list:
+		return sorted(self._countries)
+
+	def region(self, name) -> pd.DataFrame:
+		return self.table.iloc[self._regions.get(name, slice(0, 0))]
+
+	def country(self, name) -> pd.DataFrame:
+		return self.table.iloc[self._countries.get(name, slice(0, 0))]
+
+	def year(self, year) -> pd.DataFrame:
+		return self.by_year.iloc[self._years.get(year, slice(0, 0))]
+
+	def regions(self, names) -> pd.DataFrame:
+		'''Rows of several regions, in the order given.'''
+		blocks = [self._regions[name] for name in names if name in self._regions]
+		if not blocks:
+			return self.table.iloc[0:0]
+		if len(blocks) == 1:
+			return self.table.iloc[blocks[0]]
+		return self.table.iloc[np.concatenate([np.arange(b.start, b.stop) for b in blocks])]
+
+
+table_index = data.per_table(TableIndex)
@@ -0,0 +1,74 @@
+'''Per-session memo of chart outputs, keyed by the widget values each chart reads.
+
+Every chart on a page declares its inputs:
+
+	fig = memo.chart('line chart', (optionn, tuple(regional)), lambda: build_line(...))
+
+On a rerun only the charts whose inputs changed call their build function;
+the others reuse the output kept in st.session_state. Each call is timed and
+logged to the 'world_happiness.charts' logger as one JSON object per line, so
+per-chart latency can be aggregated across sessions and dynos. The logs are
+written (to stderr, unless logging is configured elsewhere) when
+WORLD_HAPPINESS_PROFILE or WORLD_HAPPINESS_DEBUG is set, or when the logger is
+enabled for INFO by the host's own logging configuration.
+'''
+import json
+import logging
+import os
+import time
+import uuid
+
+import streamlit as st
+
+import profiling
+
+
+logger = logging.getLogger('world_happiness.charts')
+if any(os.environ.get(name, '') not in ('', '0')
+		for name in ('WORLD_HAPPINESS_PROFILE', 'WORLD_HAPPINESS_DEBUG')):
+	profiling.enable_logger(logger)
+
+_OUTPUTS = '_memo_outputs'
+_TIMINGS = '_memo_timings'
+_SESSION = '_memo_session'
+_RERUN = '_memo_rerun'
+
+
+def session_id() -> str:
+	'''Id of the current session in the chart and profile logs.'''
+	return st.session_state.setdefault(_SESSION, uuid.uuid4().hex[:12])
+
+
+def begin_rerun(page: str) -> None:
+	'''Start the timing record of a new rerun of `page`.'''
+	session_id()
+	st.session_state[_RERUN] = st.session_state.get(_RERUN, 0) + 1
+	st.session_state[_TIMINGS] = []
+	st.session_state['_memo_page'] = page
+
+
+def chart(name: str, deps, build):
+	'''build()'s output for these `deps`, recomputed only when they differ from last rerun.'''
+	outputs = st.session_state.setdefault(_OUTPUTS, {})
+	entry = outputs.get(name)
+	start = time.perf_counter()
+	if entry is not None and entry[0] == deps:
+		output, recomputed = entry[1], False
+	else:
+		with profiling.section(f'chart: {name}'):
+			output = build()
+		recomputed = True
+		outputs[name] = (deps, output)
+	elapsed_ms = (time.perf_counter() - start) * 1000
+
+	record = {'chart': name, 'ms': round(elapsed_ms, 3), 'recomputed': recomputed}
+	st.session_state.setdefault(_TIMINGS, []).append(record)
+	if logger.isEnabledFor(logging.INFO):
+		logger.info(json.dumps(dict(record, session=st.session_state.get(_SESSION),
+			rerun=st.session_state.get(_RERUN), page=st.session_state.get('_memo_page'))))
+	return output
+
+
+def timings() -> list:
+	'''[{'chart', 'ms', 'recomputed'}] for every chart of the current rerun so far.'''
+	return list(st.session_state.get(_TIMINGS, []))
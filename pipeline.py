@@ -0,0 +1,413 @@
+'''Cleaning pipeline: raw World Happiness reports -> compact columnar store.
+
+This runs the same steps the 'Data Cleaning' page walks through (drop the
+columns the reports do not share, rename the 2021 columns, add the year,
+concatenate, attach each country's region) and writes the result as
+uncompressed Feather (Arrow IPC) files that can be memory-mapped on load,
+with categorical names, int16 years and float32 metrics.
+
+Every raw report is streamed in chunks through the column registry and the
+schema check into its own part under store/parts, so only a new or changed
+report is parsed again and memory stays flat however large it is. The merged
+tables are then rewritten batch by batch from the memory-mapped parts.
+
+Reports are the two registered below plus any CSV dropped into reports/
+(named with its year, e.g. world-happiness-report-2022.csv, when it has no
+year column). Run it directly to (re)build:
+
+	python pipeline.py
+'''
+import contextlib
+import glob
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import profiling
+
+try:
+	import fcntl
+except ImportError:  # not on Windows: builds are then only serialized within a process
+	fcntl = None
+
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORTS_DIR = os.path.join(DATA_DIR, 'reports')
+REPORT = 'world-happiness-report.csv'
+REPORT_2021 = 'world-happiness-report-2021.csv'
+
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+PARTS_DIR = os.path.join(STORE_DIR, 'parts')
+MANIFEST = os.path.join(STORE_DIR, 'manifest.json')
+LOCK = os.path.join(STORE_DIR, '.lock')
+MERGED_STORE = os.path.join(STORE_DIR, 'world_happiness.feather')
+ANIMATION_STORE = os.path.join(STORE_DIR, 'animation_frame.feather')
+
+FACTORS = ['Life Ladder', 'Log GDP per capita', 'Social support',
+	'Healthy life expectancy at birth', 'Freedom to make life choices',
+	'Generosity', 'Perceptions of corruption']
+COLUMNS = ['Country name', 'year'] + FACTORS
+# a report missing any other factor gets it as all-NaN
+REQUIRED = ['Country name', 'year', 'Life Ladder']
+
+# column name in some report -> column name in the store
+COLUMN_ALIASES = {
+	'Ladder score': 'Life Ladder',
+	'Logged GDP per capita': 'Log GDP per capita',
+	'Healthy life expectancy': 'Healthy life expectancy at birth',
+}
+
+# raw report -> year for single-year snapshots (None when it has a year column), in merge order
+REPORTS = {
+	REPORT: None,
+	REPORT_2021: 2021,
+}
+
+CHUNK_ROWS = 50000
+
+# sub-national rows ('<country> / <area>', or any row with a 'Parent country')
+# take the region of their parent country
+SUBNATIONAL_SEPARATOR = ' / '
+
+PART_SCHEMA = pa.schema([('Country name', pa.string()), ('year', pa.int16())]
+	+ [(factor, pa.float32()) for factor in FACTORS]
+	+ [('Regional indicator', pa.string()), ('Parent country', pa.string())])
+# bumped whenever PART_SCHEMA changes, so that parts written before are rebuilt
+PART_FORMAT = 2
+
+logger = logging.getLogger('world_happiness.pipeline')
+
+_lock = threading.Lock()
+# source signatures of the last build done by this process
+_built = None
+_store_version = None
+
+
+class SchemaError(ValueError):
+	'''A raw report that cannot be mapped onto the store's columns.'''
+
+
+def register_columns(aliases: dict) -> None:
+	'''Teach the pipeline other names a report may use for the store's columns.'''
+	COLUMN_ALIASES.update(aliases)
+
+
+def register_report(name: str, year=None) -> None:
+	'''Add a raw report (path relative to the repository) to the pipeline.'''
+	REPORTS[name] = year
+
+
+def reports() -> dict:
+	'''Registered reports followed by the ones found in reports/, in merge order.'''
+	found = dict(REPORTS)
+	for path in sorted(glob.glob(os.path.join(REPORTS_DIR, '*.csv'))):
+		name = os.path.relpath(path, DATA_DIR)
+		if name not in found:
+			match = re.search(r'(?<!\d)(\d{4})(?!\d)', os.path.basename(path))
+			found[name] = int(match.group(1)) if match else None
+	return found
+
+
+def normalize(frame: pd.DataFrame, year=None, source: str = 'report') -> pd.DataFrame:
+	'''Map one chunk of a raw report onto the part schema, validating it on the way.'''
+	frame = frame.rename(columns=lambda c: COLUMN_ALIASES.get(c.strip(), c.strip()))
+	if 'year' not in frame and year is not None:
+		frame['year'] = year
+	missing = [column for column in REQUIRED if column not in frame]
+	if missing:
+		raise SchemaError(f'{source}: missing columns {missing}')
+	if frame['Country name'].isna().any():
+		raise SchemaError(f'{source}: rows without a country name')
+
+	normalized = pd.DataFrame({'Country name': frame['Country name'].astype(str).str.strip()})
+	try:
+		years = pd.to_numeric(frame['year'])
+		for factor in FACTORS:
+			normalized[factor] = pd.to_numeric(frame[factor]) if factor in frame else np.nan
+	except (ValueError, TypeError) as e:
+		raise SchemaError(f'{source}: {e}') from None
+	if years.isna().any() or (years % 1 != 0).any() or not years.between(1900, 2999).all():
+		raise SchemaError(f'{source}: invalid year values')
+	normalized.insert(1, 'year', years.astype(np.int16))
+	# a chunk where the column is empty is read as float NaN
+	normalized['Regional indicator'] = (_strings(frame['Regional indicator'])
+		if 'Regional indicator' in frame else None)
+	names = normalized['Country name']
+	parents = names.str.partition(SUBNATIONAL_SEPARATOR)[0].where(
+		names.str.contains(SUBNATIONAL_SEPARATOR, regex=False))
+	if 'Parent country' in frame:
+		given = _strings(frame['Parent country'])
+		parents = given.where(given.notna(), parents)
+	normalized['Parent country'] = parents.astype(object).where(parents.notna(), None)
+	return normalized
+
+
+def _strings(column: pd.Series) -> pd.Series:
+	'''The values of `column` as stripped strings, with None for missing ones.'''
+	return column.map(lambda value: str(value).strip(),
+		na_action='ignore').astype(object).where(column.notna(), None)
+
+
+def ingest(source: str, part: str, year=None, chunk_rows: int = CHUNK_ROWS) -> int:
+	'''Stream the raw report `source` into the part file `part`; returns the row count.'''
+	rows = 0
+	with _StoreWriter(part, PART_SCHEMA) as writer:
+		for chunk in pd.read_csv(source, chunksize=chunk_rows, encoding='utf-8-sig'):
+			chunk = normalize(chunk, year, os.path.basename(source))
+			try:
+				batch = pa.RecordBatch.from_pandas(chunk, schema=PART_SCHEMA, preserve_index=False)
+			except (pa.ArrowException, TypeError, ValueError) as e:
+				raise SchemaError(f'{os.path.basename(source)}: {e}') from None
+			writer.write_batch(batch)
+			rows += len(chunk)
+	return rows
+
+
+def _batches(path: str):
+	reader = pa.ipc.open_file(pa.memory_map(path))
+	for i in range(reader.num_record_batches):
+		yield reader.get_batch(i)
+
+
+def _region_dict(parts: list) -> dict:
+	'''Country -> region from every report that has regional indicators (later
+	reports win), with sub-national rows mapped to their parent country's region.
+
+	Parts are read one batch at a time and only their distinct names are kept.'''
+	regions, parents, names = {}, {}, set()
+	columns = ['Country name', 'Regional indicator', 'Parent country']
+	for part in parts:
+		for batch in _batches(part):
+			frame = batch.to_pandas()[columns].drop_duplicates(keep='last')
+			names.update(frame['Country name'])
+			for name, region, parent in frame.itertuples(index=False):
+				if pd.notna(region):
+					regions[name] = region
+				if pd.notna(parent):
+					parents[name] = parent
+
+	region_dict = {}
+	for name in names:
+		region = regions.get(name) or regions.get(parents.get(name))
+		if region:
+			region_dict[name] = region
+	dropped = sorted(names - set(region_dict))
+	if dropped:
+		logger.warning('dropping %d countries without a known region: %s', len(dropped),
+			', '.join(dropped))
+	return region_dict
+
+
+def _placeholders(first_year, missing: list, columns) -> pd.DataFrame:
+	placeholders = pd.DataFrame({'Country name': 'A', 'year': first_year, 'Region': missing})
+	for factor in FACTORS:
+		placeholders[factor] = -1.0
+	return placeholders[list(columns)]
+
+
+def animation_frame(merged_table: pd.DataFrame) -> pd.DataFrame:
+	'''The merged table plus an off-screen placeholder row in the first year for
+	every region without data in it, so the animated scatter's legend and colors
+	are complete from the first frame.'''
+	first_year = merged_table['year'].min()
+	present = set(merged_table.loc[merged_table['year'] == first_year, 'Region'])
+	missing = [region for region in merged_table['Region'].unique() if region not in present]
+	placeholders = _placeholders(first_year, missing, merged_table.columns)
+	return pd.concat([merged_table, placeholders], ignore_index=True)
+
+
+def merge(parts: list) -> None:
+	'''Write the merged and animation stores from the normalized parts, one batch at a time.
+
+	Only countries with a known region (their own or their parent country's) are
+	kept, as on the 'Data Cleaning' page.'''
+	region_dict = _region_dict(parts)
+	countries = sorted(region_dict)
+	regions = sorted(set(region_dict.values()))
+	country_codes = {name: i for i, name in enumerate(countries)}
+	region_codes = {name: i for i, name in enumerate(regions)}
+	# the animation store also holds the placeholder country 'A', coded after the others
+	country_codes.setdefault('A', len(countries))
+	dictionaries = {MERGED_STORE: pa.array(countries), ANIMATION_STORE: pa.array(countries + ['A'])}
+	region_dictionary = pa.array(regions)
+	schema = pa.schema([('Country name', pa.dictionary(pa.int32(), pa.string())),
+		('year', pa.int16())] + [(factor, pa.float32()) for factor in FACTORS]
+		+ [('Region', pa.dictionary(pa.int32(), pa.string()))])
+
+	def encode(frame, store):
+		names = frame['Country name'].map(country_codes).to_numpy(np.int32)
+		region_names = frame['Region'].map(region_codes).to_numpy(np.int32)
+		arrays = [pa.DictionaryArray.from_arrays(names, dictionaries[store]),
+			pa.array(frame['year'].to_numpy(np.int16))]
+		arrays += [pa.array(frame[factor].to_numpy(np.float32), from_pandas=True)
+			for factor in FACTORS]
+		arrays.append(pa.DictionaryArray.from_arrays(region_names, region_dictionary))
+		return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+	regions_by_year = {}
+	with _StoreWriter(MERGED_STORE, schema) as merged_writer, \
+			_StoreWriter(ANIMATION_STORE, schema) as animation_writer:
+		for part in parts:
+			for batch in _batches(part):
+				frame = batch.to_pandas()
+				frame = frame.loc[frame['Country name'].isin(region_dict)]
+				if frame.empty:
+					continue
+				frame['Region'] = frame['Country name'].map(region_dict)
+				for year, group in frame.groupby('year')['Region']:
+					regions_by_year.setdefault(year, set()).update(group)
+				merged_writer.write_batch(encode(frame, MERGED_STORE))
+				animation_writer.write_batch(encode(frame, ANIMATION_STORE))
+		if regions_by_year:
+			first_year = min(regions_by_year)
+			seen = set().union(*regions_by_year.values())
+			missing = [region for region in regions if region in seen
+				and region not in regions_by_year[first_year]]
+			if missing:
+				placeholders = _placeholders(first_year, missing,
+					['Country name', 'year'] + FACTORS + ['Region'])
+				animation_writer.write_batch(encode(placeholders, ANIMATION_STORE))
+
+
+class _StoreWriter:
+	'''Arrow IPC (Feather v2) file writer that only replaces `path` once complete.'''
+
+	def __init__(self, path: str, schema: pa.Schema):
+		self.path = path
+		self._tmp = temp_path(path)
+		self._sink = pa.OSFile(self._tmp, 'wb')
+		self._writer = pa.ipc.new_file(self._sink, schema)
+
+	def write_batch(self, batch: pa.RecordBatch) -> None:
+		self._writer.write_batch(batch)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc, tb):
+		self._writer.close()
+		self._sink.close()
+		if exc_type is None:
+			os.replace(self._tmp, self.path)
+		else:
+			os.remove(self._tmp)
+
+
+def temp_path(path: str) -> str:
+	'''A new, uniquely named file next to `path` to write it through before os.replace.'''
+	fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.',
+		suffix='.tmp')
+	os.close(fd)
+	return tmp
+
+
+@contextlib.contextmanager
+def store_lock():
+	'''Hold the store's inter-process lock, so that only one process (app, API,
+	benchmark worker) builds or rewrites it at a time.'''
+	os.makedirs(STORE_DIR, exist_ok=True)
+	with open(LOCK, 'a') as f:
+		if fcntl is not None:
+			fcntl.flock(f, fcntl.LOCK_EX)
+		try:
+			yield
+		finally:
+			if fcntl is not None:
+				fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_store(frame: pd.DataFrame, path: str) -> None:
+	'''Atomically write `frame` as an uncompressed (memory-mappable) Feather file.'''
+	tmp = temp_path(path)
+	feather.write_feather(frame.reset_index(drop=True), tmp, compression='uncompressed')
+	os.replace(tmp, path)
+
+
+def read_store(path: str) -> pd.DataFrame:
+	'''Memory-map a Feather file from the store and hand it to pandas.'''
+	table = feather.read_table(path, memory_map=True)
+	return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _signature(path: str) -> list:
+	stat = os.stat(path)
+	return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_manifest() -> dict:
+	try:
+		with open(MANIFEST) as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return {}
+
+
+def _write_manifest(manifest: dict) -> None:
+	tmp = temp_path(MANIFEST)
+	with open(tmp, 'w') as f:
+		json.dump(manifest, f, indent=1)
+	os.replace(tmp, MANIFEST)
+
+
+def _part_path(name: str) -> str:
+	return os.path.join(PARTS_DIR, os.path.splitext(name)[0].replace(os.sep, '__') + '.feather')
+
+
+def build(force: bool = False) -> bool:
+	'''Bring the store up to date with the raw reports.
+
+	Only reports that are new or whose file changed since the last build are
+	parsed again. Returns True when anything was rebuilt.'''
+	global _built, _store_version
+	sources = reports()
+	signatures = {name: _signature(os.path.join(DATA_DIR, name)) for name in sources}
+	if not force and signatures == _built:
+		return False
+	# another process may have built the store while this one waited for the lock,
+	# so the manifest is only read once it is held
+	with _lock, store_lock():
+		manifest = {} if force else _read_manifest()
+		built = manifest.get('sources', {}) if manifest.get('format') == PART_FORMAT else {}
+		stale = [name for name in sources
+			if built.get(name) != signatures[name] or not os.path.exists(_part_path(name))]
+		if (not stale and set(built) == set(sources) and os.path.exists(MERGED_STORE)
+				and os.path.exists(ANIMATION_STORE)):
+			_built = signatures
+			_store_version = manifest['version']
+			return False
+
+		os.makedirs(PARTS_DIR, exist_ok=True)
+		for name in stale:
+			with profiling.section(f'ingest {name}'):
+				ingest(os.path.join(DATA_DIR, name), _part_path(name), sources[name])
+		with profiling.section('merge store'):
+			merge([_part_path(name) for name in sources])
+		_store_version = _version(signatures)
+		_write_manifest({'sources': signatures, 'format': PART_FORMAT, 'version': _store_version})
+		_built = signatures
+		return True
+
+
+def _version(signatures: dict) -> str:
+	return '-'.join(f'{mtime:x}.{size:x}' for mtime, size in signatures.values())
+
+
+def version() -> str:
+	'''Identifier of the current store contents, for caches derived from it.'''
+	build()
+	return _store_version
+
+
+if __name__ == '__main__':
+	build(force=True)
+	merged_table = read_store(MERGED_STORE)
+	print(f'{MERGED_STORE}: {len(merged_table)} rows, '
+		f'{os.path.getsize(MERGED_STORE) / 1024:.1f} KB')
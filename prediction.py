@@ -0,0 +1,89 @@
+'''Linear regression prediction model.
+
+Fits value = intercept + slope * log10(year) -- the same model as plotly's
+trendline="ols" with trendline_options=dict(log_x=True) -- for every
+country x happiness factor at once: the per-group normal equations are
+accumulated with np.add.at and solved in one batched np.linalg.solve.
+'''
+import numpy as np
+import pandas as pd
+
+import data
+import pipeline
+import profiling
+
+
+class TrendModel:
+	'''log-year OLS coefficients for every (country, factor) of one table version.'''
+
+	def __init__(self, table: pd.DataFrame, factors=pipeline.FACTORS):
+		self.factors = list(factors)
+		codes, countries = pd.factorize(table['Country name'], sort=True)
+		self.countries = list(countries)
+		self._country_pos = {name: i for i, name in enumerate(self.countries)}
+		self._factor_pos = {name: i for i, name in enumerate(self.factors)}
+
+		x = np.log10(table['year'].to_numpy(dtype=np.float64))
+		# centering keeps the 2x2 systems well conditioned: log10 years barely vary
+		self.x0 = x.mean() if len(x) else 0.0
+		x = x - self.x0
+		y = table[self.factors].to_numpy(dtype=np.float64)
+		valid = ~np.isnan(y)
+		y = np.where(valid, y, 0.0)
+		xv = valid * x[:, None]
+
+		shape = (len(self.countries), len(self.factors))
+		n, sx, sxx, sy, sxy = (np.zeros(shape) for _ in range(5))
+		np.add.at(n, codes, valid)
+		np.add.at(sx, codes, xv)
+		np.add.at(sxx, codes, xv * x[:, None])
+		np.add.at(sy, codes, y)
+		np.add.at(sxy, codes, y * x[:, None])
+
+		a = np.stack([np.stack([n, sx], -1), np.stack([sx, sxx], -1)], -2)
+		b = np.stack([sy, sxy], -1)
+		# fewer than two distinct years leaves the system singular: no fit
+		singular = np.abs(n * sxx - sx * sx) <= 1e-12 * np.maximum(n * sxx, 1e-300)
+		a[singular] = np.eye(2)
+		coef = np.linalg.solve(a, b[..., None])[..., 0]
+		coef[singular] = np.nan
+		# coef[country, factor] = (intercept, slope) against log10(year) - x0
+		self.coef = coef
+
+	def predict(self, countries=None, factors=None, years=()) -> pd.DataFrame:
+		'''Predictions for every combination of countries x factors x years, in long form.'''
+		countries = self.countries if countries is None else list(countries)
+		factors = self.factors if factors is None else list(factors)
+		years = np.asarray(years, dtype=np.float64)
+		ci = np.array([self._country_pos[c] for c in countries], dtype=np.intp)
+		fi = np.array([self._factor_pos[f] for f in factors], dtype=np.intp)
+		coef = self.coef[np.ix_(ci, fi)]
+		x = np.log10(years) - self.x0
+		values = coef[:, :, None, 0] + coef[:, :, None, 1] * x
+		grid = pd.MultiIndex.from_product([countries, factors, years.astype(int)],
+			names=['Country name', 'factor', 'year'])
+		return pd.DataFrame({'prediction': values.ravel()}, index=grid).reset_index()
+
+	def predict_one(self, country, factor, year) -> float:
+		intercept, slope = self.coef[self._country_pos[country], self._factor_pos[factor]]
+		return float(intercept + slope * (np.log10(year) - self.x0))
+
+
+def trend_figure(country_table: pd.DataFrame, factor: str, model: TrendModel, **layout):
+	'''Scatter of one country's values with the fitted trendline drawn in red.'''
+	import plotly.express as px
+
+	country = country_table['Country name'].iloc[0]
+	fig = px.scatter(country_table, y = factor, x = 'year', color = 'Country name',
+		color_discrete_sequence = ['#6495ED'], **layout)
+	years = np.sort(country_table.loc[country_table[factor].notna(), 'year'].unique())
+	trend = model.predict([country], [factor], years)
+	fig.add_scatter(x = trend['year'], y = trend['prediction'], mode = 'lines',
+		line_color = 'red', name = 'OLS trendline', showlegend = False)
+	return fig
+
+
+@data.per_table
+def trend_model(table: pd.DataFrame) -> TrendModel:
+	with profiling.section('fit trend model'):
+		return TrendModel(table)
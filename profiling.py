@@ -0,0 +1,167 @@
+'''Opt-in per-rerun profiling of the app's sections.
+
+Switched on for every session with WORLD_HAPPINESS_PROFILE=1. With
+WORLD_HAPPINESS_PROFILE=query, only the sessions opened with ?profile=1 are
+profiled; without that opt-in the query parameter is ignored, so visitors
+cannot turn on the process-wide tracemalloc. While on, every
+
+	with profiling.section('name'):
+		...
+
+records its wall time, its time outside nested sections, and (through
+tracemalloc) the memory it allocated and its peak. The breakdown of the rerun
+is shown in a sidebar panel and logged to the 'world_happiness.profile' logger
+as one JSON object per section, tagged with the session, page, dyno and
+process so logs from several dynos can be aggregated.
+
+When off, section() returns a shared no-op context manager after one
+thread-local lookup. tracemalloc is process-wide: it only runs while a
+profiled rerun is in progress, and allocations of concurrent reruns are
+attributed to whichever sections are open at the time.
+'''
+import contextlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+
+
+logger = logging.getLogger('world_happiness.profile')
+
+Section = namedtuple('Section', 'name depth ms self_ms alloc_kb peak_kb')
+
+_local = threading.local()
+_noop = contextlib.nullcontext()
+_tracing = 0
+_tracing_lock = threading.Lock()
+_DYNO = os.environ.get('DYNO') or socket.gethostname()
+
+
+def _query_flag() -> bool:
+	import streamlit as st
+
+	if hasattr(st, 'query_params'):
+		value = st.query_params.get('profile', '')
+	else:
+		value = (st.experimental_get_query_params().get('profile') or [''])[-1]
+	return value not in ('', '0', 'false')
+
+
+def enabled() -> bool:
+	setting = os.environ.get('WORLD_HAPPINESS_PROFILE', '')
+	if setting in ('', '0'):
+		return False
+	return setting != 'query' or _query_flag()
+
+
+class _Profile:
+	def __init__(self, page: str):
+		self.page = page
+		self.records = []
+		# [start, child ms, memory at start, peak seen so far, index in records]
+		self.stack = []
+		self.start = time.perf_counter()
+
+
+def begin_rerun(page: str) -> None:
+	'''Start profiling this rerun of `page` if profiling is on for the session.'''
+	global _tracing
+	_local.profile = None
+	if not enabled():
+		return
+	with _tracing_lock:
+		enable_logger(logger)
+		if _tracing == 0:
+			tracemalloc.start()
+		_tracing += 1
+	_local.profile = _Profile(page)
+
+
+def section(name: str):
+	'''Context manager timing the enclosed block in a profiled rerun, a no-op otherwise.'''
+	profile = getattr(_local, 'profile', None)
+	if profile is None:
+		return _noop
+	return _timed(profile, name)
+
+
+@contextlib.contextmanager
+def _timed(profile: _Profile, name: str):
+	memory, peak = tracemalloc.get_traced_memory()
+	if profile.stack:
+		profile.stack[-1][3] = max(profile.stack[-1][3], peak)
+	tracemalloc.reset_peak()
+	frame = [time.perf_counter(), 0.0, memory, memory, len(profile.records)]
+	profile.records.append(None)
+	profile.stack.append(frame)
+	try:
+		yield
+	finally:
+		ms = (time.perf_counter() - frame[0]) * 1000
+		memory, peak = tracemalloc.get_traced_memory()
+		peak = max(peak, frame[3])
+		profile.stack.pop()
+		if profile.stack:
+			profile.stack[-1][1] += ms
+			profile.stack[-1][3] = max(profile.stack[-1][3], peak)
+		profile.records[frame[4]] = Section(name, len(profile.stack), ms, ms - frame[1],
+			(memory - frame[2]) / 1024, (peak - frame[2]) / 1024)
+
+
+def end_rerun() -> None:
+	'''Log the sections of a profiled rerun and show them in the sidebar.'''
+	global _tracing
+	profile = getattr(_local, 'profile', None)
+	if profile is None:
+		return
+	_local.profile = None
+	with _tracing_lock:
+		_tracing -= 1
+		if _tracing == 0:
+			tracemalloc.stop()
+
+	import streamlit as st
+
+	import memo
+
+	# the same session id as the chart timing logs, so both can be joined
+	session = memo.session_id()
+	rerun = st.session_state['_profile_rerun'] = st.session_state.get('_profile_rerun', 0) + 1
+	total_ms = (time.perf_counter() - profile.start) * 1000
+	records = [r for r in profile.records if r is not None]
+	if logger.isEnabledFor(logging.INFO):
+		tags = {'session': session, 'rerun': rerun, 'page': profile.page,
+			'dyno': _DYNO, 'pid': os.getpid()}
+		for r in records:
+			logger.info(json.dumps(dict(tags, section=r.name, depth=r.depth, ms=round(r.ms, 3),
+				self_ms=round(r.self_ms, 3), alloc_kb=round(r.alloc_kb, 1),
+				peak_kb=round(r.peak_kb, 1))))
+		logger.info(json.dumps(dict(tags, section='rerun', depth=0, ms=round(total_ms, 3))))
+
+	with st.sidebar.expander(f'Profile: {total_ms:.0f} ms', expanded=True):
+		st.table([{'section': '· ' * r.depth + r.name, 'ms': round(r.ms, 1),
+			'self ms': round(r.self_ms, 1), 'alloc KB': round(r.alloc_kb),
+			'peak KB': round(r.peak_kb)} for r in records])
+
+
+def plotly_chart(target, fig, **kwargs):
+	'''target.plotly_chart(fig) (target being st or a column), in a section, as
+	that is where Streamlit serializes the figure.'''
+	with section('plotly_chart (serialize)'):
+		return target.plotly_chart(fig, **kwargs)
+
+
+def enable_logger(log: logging.Logger) -> None:
+	'''Emit the INFO records of `log`: through the root logger's handlers when
+	logging was configured elsewhere, else to stderr, one message per line.'''
+	log.setLevel(logging.INFO)
+	if log.handlers or logging.getLogger().handlers:
+		return
+	handler = logging.StreamHandler()
+	handler.setFormatter(logging.Formatter('%(message)s'))
+	log.addHandler(handler)
+	log.propagate = False
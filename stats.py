@@ -0,0 +1,117 @@
+'''Statistics behind the 'Exploratory Analysis' page.
+
+Everything is computed from the merged table in a few batched NumPy passes
+(grouped sums with np.add.at, matrix products for the correlations) instead of
+a per-rerun profile report, and cached per loaded table version.
+'''
+import numpy as np
+import pandas as pd
+
+import data
+import pipeline
+import profiling
+
+
+def correlations(table: pd.DataFrame, factors=pipeline.FACTORS) -> pd.DataFrame:
+	'''Pearson correlation between every pair of factors over the rows where both
+	are present (the same pairwise-complete rule as DataFrame.corr()).'''
+	x = table[factors].to_numpy(dtype=np.float64)
+	valid = (~np.isnan(x)).astype(np.float64)
+	x = np.where(valid > 0, x, 0.0)
+	n = valid.T @ valid
+	# sx[i, j]: sum of factor i over the rows where factor j is present
+	sx = x.T @ valid
+	sxx = (x * x).T @ valid
+	sxy = x.T @ x
+	cov = n * sxy - sx * sx.T
+	var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+	with np.errstate(invalid='ignore', divide='ignore'):
+		corr = cov / np.sqrt(var)
+	return pd.DataFrame(np.clip(corr, -1, 1), index=factors, columns=factors)
+
+
+def describe(table: pd.DataFrame, by: str, factors=pipeline.FACTORS) -> pd.DataFrame:
+	'''count, mean, std, min and max of every factor per value of `by`, in long form.'''
+	codes, keys = pd.factorize(table[by], sort=True)
+	x = table[factors].to_numpy(dtype=np.float64)
+	valid = ~np.isnan(x)
+	shape = (len(keys), len(factors))
+	count, total, squares = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+	low, high = np.full(shape, np.inf), np.full(shape, -np.inf)
+	np.add.at(count, codes, valid)
+	np.add.at(total, codes, np.where(valid, x, 0.0))
+	np.add.at(squares, codes, np.where(valid, x * x, 0.0))
+	np.minimum.at(low, codes, np.where(valid, x, np.inf))
+	np.maximum.at(high, codes, np.where(valid, x, -np.inf))
+
+	with np.errstate(invalid='ignore', divide='ignore'):
+		mean = total / count
+		# sample standard deviation, as pandas reports it
+		std = np.sqrt(np.maximum(squares - count * mean * mean, 0) / (count - 1))
+	empty = count == 0
+	low[empty], high[empty] = np.nan, np.nan
+	std[count < 2] = np.nan
+	index = pd.MultiIndex.from_product([list(keys), factors], names=[by, 'factor'])
+	return pd.DataFrame({'count': count.ravel().astype(int), 'mean': mean.ravel(),
+		'std': std.ravel(), 'min': low.ravel(), 'max': high.ravel()}, index=index)
+
+
+def year_over_year(table: pd.DataFrame, factors=pipeline.FACTORS) -> pd.DataFrame:
+	'''Change of every factor from each country's previous year (NaN across gaps).'''
+	ordered = table.sort_values(['Country name', 'year'], kind='stable')
+	x = ordered[factors].to_numpy(dtype=np.float64)
+	years = ordered['year'].to_numpy(dtype=np.int64)
+	names = ordered['Country name'].to_numpy()
+	deltas = np.full_like(x, np.nan)
+	follows = (names[1:] == names[:-1]) & (years[1:] - years[:-1] == 1)
+	deltas[1:][follows] = x[1:][follows] - x[:-1][follows]
+	out = ordered[['Country name', 'Region', 'year']].reset_index(drop=True)
+	return pd.concat([out, pd.DataFrame(deltas, columns=factors)], axis=1)
+
+
+def rolling_trends(table: pd.DataFrame, window: int = 3, factors=pipeline.FACTORS) -> pd.DataFrame:
+	'''Mean of every factor per region and year, smoothed over a trailing `window` of years.'''
+	region_codes, regions = pd.factorize(table['Region'], sort=True)
+	first = int(table['year'].min())
+	years = np.arange(first, int(table['year'].max()) + 1)
+	year_codes = table['year'].to_numpy(dtype=np.int64) - first
+	x = table[factors].to_numpy(dtype=np.float64)
+	valid = ~np.isnan(x)
+
+	shape = (len(regions), len(years), len(factors))
+	total, count = np.zeros(shape), np.zeros(shape)
+	np.add.at(total, (region_codes, year_codes), np.where(valid, x, 0.0))
+	np.add.at(count, (region_codes, year_codes), valid)
+
+	# trailing window sums along the year axis from cumulative sums
+	def windowed(a):
+		c = np.cumsum(a, axis=1)
+		c[:, window:] = c[:, window:] - c[:, :-window]
+		return c
+	with np.errstate(invalid='ignore', divide='ignore'):
+		mean = total / count
+		rolling = windowed(total) / windowed(count)
+
+	index = pd.MultiIndex.from_product([list(regions), years], names=['Region', 'year'])
+	mean = pd.DataFrame(mean.reshape(-1, len(factors)), index=index, columns=factors)
+	rolling = pd.DataFrame(rolling.reshape(-1, len(factors)), index=index, columns=factors)
+	return pd.concat({'mean': mean, 'rolling': rolling}, axis=1)
+
+
+class Statistics:
+	'''All exploratory statistics for one version of the merged table.'''
+
+	def __init__(self, table: pd.DataFrame):
+		self.correlations = correlations(table)
+		self.by_region = describe(table, 'Region')
+		self.by_year = describe(table, 'year')
+		self.year_over_year = year_over_year(table)
+		self.yoy_by_region = self.year_over_year.groupby(['Region', 'year'],
+			observed=True)[pipeline.FACTORS].mean()
+		self.trends = rolling_trends(table)
+
+
+@data.per_table
+def statistics(table: pd.DataFrame) -> Statistics:
+	with profiling.section('compute statistics'):
+		return Statistics(table)
@@ -0,0 +1,179 @@
+'''Pre-aggregated regional summary cube.
+
+For every region x year x happiness factor (plus an all-years rollup) the cube
+holds the count, mean, quartiles, Tukey whiskers and outliers that the box
+plot, the sunburst and the regional-average scatter need. It is computed once
+per store version and persisted next to the store, so pages draw those charts
+from a few hundred aggregate rows instead of the full merged table.
+'''
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import pipeline
+import profiling
+
+
+# year key of the rollup over every year
+ALL_YEARS = 0
+
+STATS_STORE = os.path.join(pipeline.STORE_DIR, 'summary_stats.feather')
+OUTLIERS_STORE = os.path.join(pipeline.STORE_DIR, 'summary_outliers.feather')
+COUNTRIES_STORE = os.path.join(pipeline.STORE_DIR, 'summary_countries.feather')
+SUMMARY_MANIFEST = os.path.join(pipeline.STORE_DIR, 'summary.json')
+
+KEYS = ['Region', 'year', 'factor']
+
+
+def _long(table: pd.DataFrame) -> pd.DataFrame:
+	long = table.melt(id_vars=['Country name', 'Region', 'year'], value_vars=pipeline.FACTORS,
+		var_name='factor', value_name='value').dropna(subset=['value'])
+	long['value'] = long['value'].astype(np.float64)
+	long['Region'] = long['Region'].astype(str)
+	long['Country name'] = long['Country name'].astype(str)
+	long['year'] = long['year'].astype(np.int16)
+	return long
+
+
+def _describe(long: pd.DataFrame):
+	groups = long.groupby(KEYS, sort=True)['value']
+	stats = groups.agg(['count', 'mean', 'min', 'max'])
+	# linear interpolation, the same quartile method as plotly's box traces
+	quartiles = groups.quantile([0.25, 0.5, 0.75]).unstack()
+	stats['q1'], stats['median'], stats['q3'] = quartiles[0.25], quartiles[0.5], quartiles[0.75]
+	iqr = stats['q3'] - stats['q1']
+	fences = pd.DataFrame({'low': stats['q1'] - 1.5 * iqr, 'high': stats['q3'] + 1.5 * iqr})
+
+	long = long.join(fences, on=KEYS)
+	inside = long['value'].between(long['low'], long['high'])
+	whiskers = long.loc[inside].groupby(KEYS)['value'].agg(['min', 'max'])
+	stats['lower'], stats['upper'] = whiskers['min'], whiskers['max']
+	outliers = long.loc[~inside, KEYS + ['Country name', 'value']]
+	return stats.drop(columns=['min', 'max']).reset_index(), outliers.reset_index(drop=True)
+
+
+def build_cube(table: pd.DataFrame):
+	'''(stats, outliers, countries) frames for one version of the merged table.'''
+	long = _long(table)
+	rollup = long.assign(year=np.int16(ALL_YEARS))
+	stats, outliers = zip(_describe(long), _describe(rollup))
+	countries = table.assign(Region=table['Region'].astype(str),
+		**{'Country name': table['Country name'].astype(str)})
+	countries = countries.groupby(['Region', 'Country name'], sort=True)[pipeline.FACTORS].sum()
+	return (pd.concat(stats, ignore_index=True), pd.concat(outliers, ignore_index=True),
+		countries.reset_index())
+
+
+class SummaryCube:
+
+	def __init__(self, stats: pd.DataFrame, outliers: pd.DataFrame, countries: pd.DataFrame,
+			version: str = None):
+		self.version = version
+		self.stats = stats.set_index(KEYS).sort_index()
+		self.outliers = outliers
+		self.countries = countries
+
+	def box(self, factor: str, year: int = ALL_YEARS) -> pd.DataFrame:
+		'''One row of box statistics per region.'''
+		stats = self.stats.xs((year, factor), level=['year', 'factor'])
+		return stats.reset_index()
+
+	def box_outliers(self, factor: str, year: int = ALL_YEARS) -> pd.DataFrame:
+		outliers = self.outliers
+		return outliers.loc[(outliers['factor'] == factor) & (outliers['year'] == year)]
+
+	def region_means(self) -> pd.DataFrame:
+		'''Mean of every factor per region and year, one row per (region, year).'''
+		means = self.stats['mean'].drop(ALL_YEARS, level='year').unstack('factor')
+		return means[pipeline.FACTORS].reset_index()
+
+	def region_animation_table(self) -> pd.DataFrame:
+		'''Regional means shaped like data.animation_table(), one point per region and year.'''
+		means = self.region_means()
+		means['Country name'] = means['Region']
+		return pipeline.animation_frame(means)
+
+	def country_totals(self, factor: str) -> pd.DataFrame:
+		return self.countries[['Region', 'Country name', factor]]
+
+
+def _save(cube_frames, version: str) -> None:
+	for frame, path in zip(cube_frames, [STATS_STORE, OUTLIERS_STORE, COUNTRIES_STORE]):
+		pipeline.write_store(frame, path)
+	tmp = pipeline.temp_path(SUMMARY_MANIFEST)
+	with open(tmp, 'w') as f:
+		json.dump({'version': version}, f)
+	os.replace(tmp, SUMMARY_MANIFEST)
+
+
+def _load(version: str):
+	try:
+		with open(SUMMARY_MANIFEST) as f:
+			if json.load(f).get('version') != version:
+				return None
+		return [pipeline.read_store(path) for path in [STATS_STORE, OUTLIERS_STORE, COUNTRIES_STORE]]
+	except (OSError, ValueError):
+		return None
+
+
+_cube = None
+_lock = threading.Lock()
+
+
+def regional_cube() -> SummaryCube:
+	'''The cube for the current store version, read from disk or built and saved once.'''
+	global _cube
+	version = pipeline.version()
+	cube = _cube
+	if cube is not None and cube.version == version:
+		return cube
+	with _lock:
+		if _cube is None or _cube.version != version:
+			with profiling.section('summary cube'), pipeline.store_lock():
+				frames = _load(version)
+				if frames is None:
+					frames = build_cube(pipeline.read_store(pipeline.MERGED_STORE))
+					_save(frames, version)
+			_cube = SummaryCube(*frames, version=version)
+		return _cube
+
+
+def box_figure(cube: SummaryCube, factor: str, colors=None, **layout):
+	'''Box plot by region drawn from precomputed statistics.'''
+	import plotly.graph_objects as go
+
+	stats = cube.box(factor)
+	outliers = cube.box_outliers(factor)
+	fig = go.Figure()
+	for i, row in enumerate(stats.itertuples(index=False)):
+		color = colors[i % len(colors)] if colors else None
+		fig.add_box(x=[row.Region], q1=[row.q1], median=[row.median], q3=[row.q3],
+			lowerfence=[row.lower], upperfence=[row.upper], mean=[row.mean],
+			name=row.Region, legendgroup=row.Region, marker_color=color)
+		points = outliers.loc[outliers['Region'] == row.Region]
+		fig.add_scatter(x=points['Region'], y=points['value'], mode='markers',
+			marker_color=color, hovertext=points['Country name'], name=row.Region,
+			legendgroup=row.Region, showlegend=False)
+	fig.update_layout(xaxis_title='Region', yaxis_title=factor, legend_title_text='Region',
+		boxmode='overlay', **layout)
+	return fig
+
+
+def sunburst_figure(cube: SummaryCube, factor: str, **layout):
+	'''Region -> country sunburst sized by the sum of `factor` over all years.'''
+	import plotly.graph_objects as go
+
+	countries = cube.country_totals(factor)
+	regions = list(countries['Region'].unique())
+	ids = regions + list(countries['Region'] + '/' + countries['Country name'])
+	labels = regions + list(countries['Country name'])
+	parents = [''] * len(regions) + list(countries['Region'])
+	# regions carry no value of their own: their sectors are the sum of their countries
+	values = np.concatenate([np.zeros(len(regions)), countries[factor].to_numpy()])
+	fig = go.Figure(go.Sunburst(ids=ids, labels=labels, parents=parents, values=values,
+		branchvalues='remainder'))
+	fig.update_layout(**layout)
+	return fig
@@ -0,0 +1,97 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+import pytest
+
+import api
+import data
+
+
+@pytest.fixture(scope='module')
+def base_url():
+	server = api.serve(0, '127.0.0.1')
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield f'http://127.0.0.1:{server.server_address[1]}'
+	server.shutdown()
+	server.server_close()
+
+
+def _get(base_url, path, headers=None, **query):
+	url = f'{base_url}{path}?{urlencode(query, doseq=True)}'
+	try:
+		with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as r:
+			body = r.read()
+			return r.status, r.headers, json.loads(body) if body else None
+	except urllib.error.HTTPError as e:
+		body = e.read()
+		return e.code, e.headers, json.loads(body) if body else None
+
+
+def _walk(base_url, path, **query):
+	'''Every record of a paginated endpoint, following next_offset.'''
+	records, offset, pages = [], 0, 0
+	while offset is not None:
+		status, _, page = _get(base_url, path, offset=offset, **query)
+		assert status == 200
+		records += page[path.strip('/')]
+		offset = page['next_offset']
+		pages += 1
+		assert pages < 1000
+	return records, page['total']
+
+
+def test_rows_pagination_covers_every_row(base_url):
+	records, total = _walk(base_url, '/rows', region='South Asia', limit=7)
+	assert total == len(records) == len(data.merged_index().region('South Asia'))
+	assert {r['Region'] for r in records} == {'South Asia'}
+
+
+def test_predictions_pagination_matches_the_model(base_url):
+	query = dict(country=['Finland', 'Chad', 'Nepal'], factor=['Life Ladder', 'Generosity'],
+		year=[2022, 2030])
+	records, total = _walk(base_url, '/predictions', limit=5, **query)
+	assert total == len(records) == 12
+	status, _, everything = _get(base_url, '/predictions', limit=1000, **query)
+	assert everything['next_offset'] is None and everything['predictions'] == records
+	assert records[0]['Country name'] == 'Finland' and records[-1]['Country name'] == 'Nepal'
+
+
+def test_offset_past_the_end_is_an_empty_last_page(base_url):
+	status, _, page = _get(base_url, '/predictions', year=2022, offset=10**6)
+	assert status == 200
+	assert page['predictions'] == [] and page['next_offset'] is None
+
+
+@pytest.mark.parametrize('path, query', [
+	('/predictions', dict(year=2022, limit=0)),
+	('/rows', dict(limit=0)),
+	('/rows', dict(offset=-1)),
+	('/predictions', dict(year=-5)),
+	('/predictions', dict(year=3000)),
+	('/predictions', dict()),
+	('/predictions', dict(year='next')),
+	('/predictions', dict(year=2022, country='Atlantis')),
+	('/predictions', dict(year=2022, factor='Wealth')),
+	('/regions', dict(factor='Wealth')),
+])
+def test_invalid_requests_are_rejected(base_url, path, query):
+	status, _, body = _get(base_url, path, **query)
+	assert status == 400 and body['error']
+
+
+def test_unknown_path_is_not_found(base_url):
+	status, _, body = _get(base_url, '/nope')
+	assert status == 404 and '/rows' in body['paths']
+
+
+def test_conditional_request_is_not_modified(base_url):
+	status, headers, _ = _get(base_url, '/meta')
+	assert status == 200 and headers['ETag']
+	status, _, body = _get(base_url, '/meta', headers={'If-None-Match': headers['ETag']})
+	assert status == 304 and body is None
+	status, other, _ = _get(base_url, '/rows', headers={'If-None-Match': headers['ETag']})
+	assert status == 200 and other['ETag'] != headers['ETag']
@@ -0,0 +1,73 @@
+import base64
+
+import numpy as np
+import pytest
+
+import data
+import figures
+import summary
+
+
+def _merge(state: dict, update: dict) -> None:
+	for key, value in update.items():
+		if isinstance(value, dict) and isinstance(state.get(key), dict):
+			_merge(state[key], value)
+		else:
+			state[key] = value
+
+
+def _replay(fig: dict, order: list):
+	'''The trace states after animating to each frame in `order`, merging every
+	frame onto the current state as Plotly.animate does.'''
+	state = [dict(trace) for trace in fig['data']]
+	for position in order:
+		frame = fig['frames'][position]
+		for i, trace in zip(frame.get('traces') or range(len(frame['data'])), frame['data']):
+			_merge(state[i], trace)
+		yield frame['name'], state
+
+
+def _array(value):
+	'''Decode plotly's typed-array form ({'dtype', 'bdata'}) of a numpy array.'''
+	if isinstance(value, dict) and 'bdata' in value:
+		array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+		return array.reshape(value['shape']) if 'shape' in value else array
+	return np.asarray(value)
+
+
+def _assert_same(actual, expected, path: str) -> None:
+	if isinstance(expected, dict) and 'bdata' not in expected:
+		assert isinstance(actual, dict), path
+		for key, value in expected.items():
+			_assert_same(actual.get(key), value, f'{path}.{key}')
+		return
+	actual, expected = _array(actual), _array(expected)
+	if expected.dtype.kind in 'fiub':
+		# compacted frames carry values rounded to 3 decimals
+		np.testing.assert_allclose(actual.astype(float), expected.astype(float), atol=1e-3,
+			err_msg=path)
+	else:
+		assert actual.tolist() == expected.tolist(), path
+
+
+ANIMATED = {
+	'choropleth': lambda compact: figures.choropleth(data.merged_table(), 'Life Ladder', compact),
+	'scatter by country': lambda compact: figures.animated_scatter(data.animation_table(),
+		'Life Ladder', 'Generosity', 'Country name', compact),
+	'scatter by region': lambda compact: figures.animated_scatter(
+		summary.regional_cube().region_animation_table(), 'Log GDP per capita', 'Social support',
+		'Region', compact),
+}
+
+
+@pytest.mark.parametrize('name', sorted(ANIMATED))
+@pytest.mark.parametrize('direction', ['forward', 'reverse'])
+def test_compacted_frames_replay_like_full_frames(name, direction):
+	full = ANIMATED[name](False).to_plotly_json()
+	compacted = ANIMATED[name](True).to_plotly_json()
+	order = list(range(len(full['frames'])))
+	if direction == 'reverse':
+		order.reverse()
+	for (frame, expected), (_, actual) in zip(_replay(full, order), _replay(compacted, order)):
+		for i, trace in enumerate(expected):
+			_assert_same(actual[i], trace, f'frame {frame}, trace {i}')
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+import pipeline
+
+
+def _report(path, **columns):
+	frame = pd.read_csv(pipeline.os.path.join(pipeline.DATA_DIR, pipeline.REPORT_2021)).head(5)
+	for column, value in columns.items():
+		frame[column] = value
+	frame.to_csv(path, index=False)
+	return frame
+
+
+def test_ingest_empty_regional_indicator(tmp_path):
+	source, part = tmp_path / 'report-2022.csv', tmp_path / 'part.feather'
+	_report(source, **{'Regional indicator': np.nan})
+	assert pipeline.ingest(str(source), str(part), 2022) == 5
+	table = feather.read_table(str(part))
+	assert table.column('Regional indicator').null_count == 5
+
+
+def test_ingest_unconvertible_column_is_schema_error(tmp_path):
+	source, part = tmp_path / 'report-2022.csv', tmp_path / 'part.feather'
+	_report(source, **{'Ladder score': 'high'})
+	with pytest.raises(pipeline.SchemaError):
+		pipeline.ingest(str(source), str(part), 2022)
+	assert list(tmp_path.iterdir()) == [source]
+
+
+def test_merge_maps_subnational_rows_to_parent_region(tmp_path, monkeypatch):
+	monkeypatch.setattr(pipeline, 'MERGED_STORE', str(tmp_path / 'merged.feather'))
+	monkeypatch.setattr(pipeline, 'ANIMATION_STORE', str(tmp_path / 'animation.feather'))
+	national = _report(tmp_path / 'report-2021.csv')
+	subnational = national.drop(columns='Regional indicator')
+	subnational['Country name'] = subnational['Country name'] + ' / North'
+	subnational.loc[0, 'Country name'] = 'Lapland'
+	subnational['Parent country'] = [national['Country name'][0]] + [None] * 4
+	subnational.loc[4, 'Country name'] = 'Atlantis / North'
+	subnational.to_csv(tmp_path / 'report-2022.csv', index=False)
+
+	parts = []
+	for year in (2021, 2022):
+		parts.append(str(tmp_path / f'part-{year}.feather'))
+		pipeline.ingest(str(tmp_path / f'report-{year}.csv'), parts[-1], year)
+	pipeline.merge(parts)
+
+	merged = pipeline.read_store(pipeline.MERGED_STORE)
+	regions = dict(zip(merged['Country name'].astype(str), merged['Region'].astype(str)))
+	assert len(merged) == 9
+	assert regions['Lapland'] == national['Regional indicator'][0]
+	assert regions[national['Country name'][1] + ' / North'] == national['Regional indicator'][1]
+	assert 'Atlantis / North' not in regions
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+import pipeline
+import prediction
+
+
+YEARS = [2005, 2022, 2050]
+
+
+def test_trend_model_matches_polyfit_on_log_years():
+	table = data.merged_table()
+	model = prediction.TrendModel(table)
+	predicted = model.predict(None, None, YEARS).set_index(['Country name', 'factor', 'year'])
+	fitted = 0
+	for country, rows in table.groupby('Country name', observed=True):
+		for factor in pipeline.FACTORS:
+			valid = rows[factor].notna()
+			x = np.log10(rows.loc[valid, 'year'].to_numpy(dtype=np.float64))
+			y = rows.loc[valid, factor].to_numpy(dtype=np.float64)
+			got = [predicted.loc[(country, factor, year), 'prediction'] for year in YEARS]
+			if len(np.unique(x)) < 2:
+				assert np.isnan(got).all(), (country, factor)
+				continue
+			expected = np.polyval(np.polyfit(x, y, 1), np.log10(YEARS))
+			np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9,
+				err_msg=f'{country} / {factor}')
+			fitted += 1
+	assert fitted > 900
+
+
+def test_trend_model_without_two_years_predicts_nan():
+	table = pd.DataFrame({
+		'Country name': ['Solo', 'Same year', 'Same year', 'Pair', 'Pair'],
+		'year': [2010, 2012, 2012, 2010, 2020],
+		'Life Ladder': [5.0, 4.0, 6.0, 4.0, 6.0],
+		'Generosity': [0.1, 0.2, 0.3, np.nan, 0.4],
+	})
+	model = prediction.TrendModel(table, factors=['Life Ladder', 'Generosity'])
+	assert np.isnan(model.predict_one('Solo', 'Life Ladder', 2022))
+	assert np.isnan(model.predict_one('Same year', 'Life Ladder', 2022))
+	# only one year of Generosity is recorded for Pair
+	assert np.isnan(model.predict_one('Pair', 'Generosity', 2022))
+	assert model.predict_one('Pair', 'Life Ladder', 2010) == pytest.approx(4.0)
+	assert model.predict_one('Pair', 'Life Ladder', 2020) == pytest.approx(6.0)
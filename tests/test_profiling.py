@@ -0,0 +1,33 @@
+from benchmarks.apptest import app_test
+
+
+def _profile_sections(at) -> list:
+	panel = [e for e in at.sidebar.expander if e.label.startswith('Profile')]
+	assert panel, 'no profile panel in the sidebar'
+	return [name.lstrip('· ') for name in panel[0].table[0].value['section']]
+
+
+def test_exploratory_rerun_times_every_plotly_chart(monkeypatch):
+	monkeypatch.setenv('WORLD_HAPPINESS_PROFILE', '1')
+	at = app_test('Exploratory Analysis')
+	at.run(timeout=120)
+	assert not at.exception
+	# correlation heatmap, year-over-year and rolling trends
+	assert _profile_sections(at).count('plotly_chart (serialize)') == 3
+
+	at.selectbox[0].set_value('Generosity')
+	at.run(timeout=120)
+	assert not at.exception
+	assert _profile_sections(at).count('plotly_chart (serialize)') == 3
+
+
+def test_query_parameter_needs_the_environment_opt_in(monkeypatch):
+	monkeypatch.setenv('WORLD_HAPPINESS_PROFILE', '')
+	at = app_test('Abstract')
+	at.query_params['profile'] = '1'
+	at.run(timeout=120)
+	assert not [e for e in at.sidebar.expander if e.label.startswith('Profile')]
+
+	monkeypatch.setenv('WORLD_HAPPINESS_PROFILE', 'query')
+	at.run(timeout=120)
+	assert _profile_sections(at)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+import pipeline
+import stats
+
+
+def test_correlations_match_pandas():
+	table = data.merged_table()
+	got = stats.correlations(table)
+	expected = table[pipeline.FACTORS].corr()
+	np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-12)
+	assert list(got.index) == list(got.columns) == pipeline.FACTORS
+
+
+@pytest.mark.parametrize('by', ['Region', 'year'])
+def test_describe_matches_pandas_groupby(by):
+	table = data.merged_table()
+	got = stats.describe(table, by)
+	# the store keeps factors as float32, which pandas would aggregate in float32
+	table = table.astype({factor: np.float64 for factor in pipeline.FACTORS})
+	expected = (table.groupby(by, observed=True)[pipeline.FACTORS]
+		.agg(['count', 'mean', 'std', 'min', 'max'])
+		.stack(level=0, future_stack=True).rename_axis([by, 'factor']))
+	got = got.loc[expected.index]
+	assert (got['count'].to_numpy() == expected['count'].to_numpy()).all()
+	for column in ('mean', 'std', 'min', 'max'):
+		np.testing.assert_allclose(got[column].to_numpy(), expected[column].to_numpy(),
+			rtol=1e-9, atol=1e-12, err_msg=f'{by} / {column}')
+
+
+def test_describe_without_values():
+	table = pd.DataFrame({'Region': ['A', 'A', 'B'], 'Life Ladder': [1.0, 3.0, np.nan]})
+	got = stats.describe(table, 'Region', ['Life Ladder'])
+	assert got.loc[('A', 'Life Ladder')].to_dict() == pytest.approx(
+		{'count': 2, 'mean': 2.0, 'std': np.sqrt(2), 'min': 1.0, 'max': 3.0})
+	empty = got.loc[('B', 'Life Ladder')]
+	assert empty['count'] == 0
+	assert empty[['mean', 'std', 'min', 'max']].isna().all()
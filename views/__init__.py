@@ -0,0 +1,22 @@
+'''One module per page of the navigation pane, each exposing render().
+
+Pages are imported on first selection only, so a session that never opens
+'Data Analysis' never pays for plotly, pandas or the dataset.
+'''
+import importlib
+
+
+PAGES = {
+	'Abstract': 'abstract',
+	'Background Information': 'background',
+	'Data Cleaning': 'cleaning',
+	'Familiarizing with Data': 'familiarizing',
+	'Exploratory Analysis': 'exploratory',
+	'Data Analysis': 'analysis',
+	'Conclusion': 'conclusion',
+	'Bibliography': 'bibliography',
+}
+
+
+def load(page: str):
+	return importlib.import_module(f'{__name__}.{PAGES[page]}')
@@ -0,0 +1,29 @@
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+import assets
+
+
+def render():
+	st.title('Abstract')
+
+	lottie_coding = assets.lottie('abstract')
+	if lottie_coding is not None:
+		st_lottie(
+			lottie_coding,
+			speed=1,
+			reverse=False,
+			loop=True,
+			quality="low", # medium ; high
+			height=None,
+			width=300,
+			key=None,
+			)
+
+	st.markdown('The World Happiness Report is a landmark survey of the state of global happiness. Nowadays, the increase in global recognition of the report is gaining new momentum, as happiness indicators are being widely applied across governments, companies and organizations to inform their policy-making decisions. These measurements of how happy citizens perceive themselves to be are proven to be effective in evaluating the progress of countries and regions.')
+	st.markdown('In this case study, we will closely examine the data collected from the report and assess the difference between the national average of happiness scores in different countries, analyze the growth of happiness predictors over time as well as interpret the potential factors that affected the results. In addition, a prediction model will be constructed as a reference to future happiness values.')
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	st.caption('Made by Selina Qiu')
@@ -0,0 +1,197 @@
+import plotly.express as px
+import streamlit as st
+from annotated_text import annotated_text
+
+import data
+import figures
+import memo
+import pipeline
+import profiling
+import prediction
+import summary
+
+
+def render():
+	memo.begin_rerun('Data Analysis')
+	
+	st.title('Data Analysis')
+	st.header('Regional Difference')
+	st.markdown('Throughout history, it is known that countries that are adjacent to one another or are in the same geographical region are likely to have similar circumstances in many aspects. This is also true in happiness scores. Through the different visualizations, it is observed that countries of separate regions are probable to have incompatible values.')
+	col1,col2 = st.columns([4,5])
+	col1.subheader('Scatter comparison between countries by region')
+	roption = col1.selectbox(
+     'Select the region you would like to evaluate',
+     ('Central and Eastern Europe','Commonwealth of Independent States', 'South Asia',
+       'Middle East and North Africa', 'Latin America and Caribbean', 'North America and ANZ',
+       'Western Europe', 'Sub-Saharan Africa', 'Southeast Asia',
+       'East Asia'))
+	hfoption = col1.selectbox(
+     'Select the happiness factor you would like to evaluate',
+     ('Healthy life expectancy at birth', 'Life Ladder',
+       'Social support', 'Generosity',
+       'Log GDP per capita', 'Perceptions of corruption',
+       'Freedom to make life choices'))
+	merged_table = data.merged_table()
+	merged_index = data.merged_index()
+	version = pipeline.version()
+	profiling.plotly_chart(col2, memo.chart('region scatter', (roption, hfoption, version),
+		lambda: px.scatter(merged_index.region(roption), y = hfoption, color = 'Country name', x= 'year',
+		size = 'year', size_max = 12)))
+	col1.markdown('This scatter plot visualizes the happiness values of countries sorted in the regions to which they belong. Notice how the y-axis scale changes according to the region selected, this difference shows the variation of happiness levels across different regions.')
+	col1.markdown('')
+	col1.markdown('')
+	col1.subheader('Scatter comparison between regions - Global')
+	hf1option = col1.selectbox(
+     'Select the first happiness factor you would like to evaluate',
+     ('Healthy life expectancy at birth', 'Life Ladder',
+       'Social support', 'Generosity',
+       'Log GDP per capita', 'Perceptions of corruption',
+       'Freedom to make life choices'))
+	hf2option = col1.selectbox(
+     'Select the second happiness factor you would like to evaluate',
+     ( 'Life Ladder','Healthy life expectancy at birth',
+       'Social support', 'Generosity',
+       'Log GDP per capita', 'Perceptions of corruption',
+       'Freedom to make life choices'))
+	foption = col1.selectbox(
+     'Select the format of display: by regional average or individual countries',
+     ('Region','Country name'))
+	col1.caption('Press the play button to view animation')
+
+	def animated_scatter():
+		if foption == 'Region':
+			ani_data = summary.regional_cube().region_animation_table()
+		else:
+			ani_data = data.animation_table()
+		return figures.cache.get(('animated scatter', hf1option, hf2option, foption, version),
+			lambda: figures.animated_scatter(ani_data, hf1option, hf2option, foption))
+
+	figure_stats = []
+	def cached_figure(name, deps, build):
+		fig, stats = memo.chart(name, deps, build)
+		if not memo.timings()[-1]['recomputed']:
+			# reused from this session's memo: nothing was built or looked up in this rerun
+			stats = stats._replace(build_ms=0.0, hit=True)
+		figure_stats.append(stats)
+		return fig
+	profiling.plotly_chart(col2, cached_figure('animated scatter', (hf1option, hf2option, foption, version),
+		animated_scatter))
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	st.subheader('Box plot - life ladder comparison by region')
+	
+	st.markdown('Through this box and whiskers plot visualization, outliers that are out of the upper and lower fence ranges of their regions are represented as individual dots and are easily identified. Such as Afghanistan, the hover data displays that it has a life ladder of 2.375, whereas the lower fence of its allotted region -South Asia- is 3.131. Other than identifying outliers, this plot also helps us to visualize and compare the average as well as the range of values of different regions. It is easily observed that North America and ANZ and Western Europe are concentrated at a relatively high ladder score, on the other hand, South Asia and Sub-Saharan Africa have the lowest span.')
+	profiling.plotly_chart(st, memo.chart('box plot', (version,),
+		lambda: summary.box_figure(summary.regional_cube(), 'Life Ladder', colors = px.colors.qualitative.Light24, width = 1100, height = 500)))
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	col3,col4 = st.columns([4,5])
+	col3.subheader('Choropleth map visualization')
+	hp3option = col3.selectbox('Select the happiness factor you would like to evaluate',
+		( 'Life Ladder','Healthy life expectancy at birth',
+			'Social support', 'Generosity',
+			'Log GDP per capita', 'Perceptions of corruption',
+			'Freedom to make life choices'))
+	col3.caption('Press the play button to view animation')
+	col3.caption('Click and drag the choropleth to rotate the globe')
+	col3.caption('Hover over a colored area to view the country name and its specific allotted values.')
+	profiling.plotly_chart(col4, cached_figure('choropleth', (hp3option, version),
+		lambda: figures.cache.get(('choropleth', hp3option, version),
+			lambda: figures.choropleth(merged_table, hp3option))))
+
+
+
+	col5,col6 = st.columns([4,5])
+	col5.markdown('### Three-Dimensional Scatter Plot')
+	col5.markdown('This scatter plot shows the relation between values from 3 axes: \'Life Ladder\', \'Log GDP per capita\' and \'Generosity\', with each dot representing one country and its happiness status in the year 2021. The colors are attributed according to the country\'s region, helping visualize and differentiate the distribution of happiness levels in various regions.')
+	col5.caption('Click and drag the scatter plot to rotate and change orientation.')
+	col5.caption('Hover over a dot to view the country name and its specific allotted values.')
+	profiling.plotly_chart(col6, memo.chart('3d scatter', (version,), lambda: px.scatter_3d(merged_index.year(2021), x = 'Life Ladder', y = 'Generosity', z = 'Log GDP per capita',  size_max = 5,
+              color = 'Region', height = 600, width = 800, hover_name = 'Country name')))
+	st.markdown('Through these visualizations, it is easily observed that there are trends in happiness factors of the countries from the same region. The statistics show that the happiness values of the regions Western Europe and especially North America and ANZ have a more compact structure - in other words the range of varying values for those two regions is relatively small (as seen on the box plot) and has a high average score compared with other regions that are represented in the data. For there to be a high happiness score, the region\'s economy is a key contributing factor. Looking closer, it is recognized that countries of Western Europe are rich in agricultural and industrial diversity, generally have more developed economies, and obtain a high level of income per capita. Moreover, North America, Australia, and New Zealand are all developed countries. So it is easily justifiable for those regions to obtain high happiness levels. On the other hand, the values of South Asia and South-Saharan Africa are concentrated at a comparatively low span. This might be because these two regions mainly consist of developing countries, and the latter has the world\'s lowest total GDP.')
+	st.header('Predictors progression')
+	st.subheader('Line chart - growth of happiness factors over time')
+
+	optionn = st.selectbox(
+     'Select the happiness factor you would like to evaluate',
+     ('Life Ladder','Healthy life expectancy at birth',
+       'Social support', 'Freedom to make life choices', 'Generosity',
+       'Log GDP per capita', 'Perceptions of corruption'))
+
+
+	col7, col8 = st.columns([10,15])
+	regional = []
+	col7.caption('Check the boxes to display allotted data')
+	sa = col7.checkbox('South Asia')
+	cee = col7.checkbox('Central and Eastern Europe', value = True)
+	mena = col7.checkbox('Middle East and North Africa')
+	lac = col7.checkbox('Latin America and Caribbean')
+	cis = col7.checkbox('Commonwealth of Independent States')
+	naa = col7.checkbox('North America and ANZ')
+	we = col7.checkbox('Western Europe')
+	ssa = col7.checkbox('Sub-Saharan Africa')
+	sea = col7.checkbox('Southeast Asia')
+	ea = col7.checkbox('East Asia')
+	if sa: 
+		regional.append('South Asia')
+	if cee: 
+		regional.append('Central and Eastern Europe')
+	if mena: 
+		regional.append('Middle East and North Africa')
+	if lac: 
+		regional.append('Latin America and Caribbean')
+	if cis: 
+		regional.append('Commonwealth of Independent States')
+	if naa: 
+		regional.append('North America and ANZ')
+	if we: 
+		regional.append('Western Europe')
+	if ssa: 
+		regional.append('Sub-Saharan Africa')
+	if sea: 
+		regional.append('Southeast Asia')
+	if ea: 
+		regional.append('East Asia')
+	overlay = col7.selectbox('Select an overlay to compare the countries with', figures.LINE_OVERLAYS)
+	col7.caption(f'With more than {figures.LINE_PACK_THRESHOLD} countries displayed, their lines are drawn in a single color - hover over a line to view the country name.')
+	#col8.plotly_chart(px.line(check_data, y = optionn, color = 'Country name', x= 'year', height = 500))
+	profiling.plotly_chart(col8, memo.chart('line chart', (optionn, tuple(regional), overlay, version),
+		lambda: figures.line_chart(merged_index.regions(regional), optionn, overlay, height = 500)))
+	st.markdown('In this graph, you can choose to visualize the progression of any happiness factor in the data set. In the textual analysis, however, we will focus on three major happiness factors and their trends over the years. Other than observing the growth of happiness factors over time, we will also investigate the reasons behind sudden changes to the trendlines, and associate them with political, environmental, or economical shifts in that allotted time period that are potentially responsible for the shifts.')
+	st.markdown('###### Life Ladder')
+	st.markdown('The Life Ladder is the average value of citizens\' self-evaluation of their current status in life. Through the line graph, we can see that the life ladder of each country has many drops and rises throughout the years in no particular global pattern. However, it still can be seen that the general trend is that the life ladder values are growing over time.')
+	st.markdown('###### Healthy life expectancy at birth')
+	st.markdown('On the other hand, the healthy life expectancy at birth has relatively stable growth and has a much more obvious trend. We can see that - using the visualization - the healthy life expectancy has been increasing fairly steadily over the years, with no disruption to the rising pattern except for the year 2021, during which all the countries seems to have taken a dip in their values. With the coronavirus, pandemic stretching on for the second year along with the emergence of new variants, and as the restrictions continue to be imposed upon citizens, professionals claim that the year brought on a "new low" in people\'s mental health globally. Not only have people exposed to the risk of contracting the deadly virus which can severely damage health and major organs permanently, but the added depression among citizens also lowers the life expectancy on a global level. Studies find that poor mental health can lead to a decrease in longevity. ')
+	st.markdown('###### Log GDP per capita')
+	st.markdown('Similarly to healthy life expectancy at birth, log GDP per capita has a steady trendline with general upward growth. One disruption to the trend is the year 2020, in which the majority of countries had a decrease in their GDP value but recovered some growth in the following year. The cause of that is likely to be the COVID-19 recession (a global economic recession due to the pandemic breakout), which started in most countries in early February 2020. The pandemic significantly slowed consumer activity. Other than that, the 2020 stock market crash was also a major factor that contributed to the recession in economic growth. And precautions that the governments took against it - such as the lockdown, limit in numbers in public spaces, etc. - rapidly increased unemployment and product prices.')
+	st.markdown('')
+	st.markdown('')
+	st.markdown('')
+	st.subheader('Linear Regression Prediction Model')
+	col9,col10 = st.columns(2)
+	year_num = col9.number_input('Insert the year you would like to predict/check for', value = 2022, min_value = 2005, max_value = 2100)
+	country_option = col10.selectbox('Select the country you would like to evaluate', merged_index.countries)
+	optionn2 = st.selectbox(
+     'Select the happiness factor you would like to evaluate',
+     ('Log GDP per capita','Healthy life expectancy at birth',
+       'Social support', 'Life Ladder', 'Freedom to make life choices', 'Generosity', 'Perceptions of corruption'))
+	button = st.button('Return Result')
+	if button : 
+		def predict():
+			model = prediction.trend_model(merged_table)
+			return (model.predict_one(country_option, optionn2, year_num),
+				prediction.trend_figure(merged_index.country(country_option), optionn2, model, width = 960))
+		pred_y, fig = memo.chart('prediction', (year_num, country_option, optionn2, version), predict)
+		annotated_text(f'〚Predicted {optionn2} in {year_num} for {country_option}:',(f'{pred_y:.2f}', '', "#F0F3F4  "),'〛')
+		profiling.plotly_chart(st, fig)
+	else: 
+		st.caption('Click to return data prediction when variables are inputted')
+	if figures.debug_enabled():
+		figures.debug_panel(figure_stats)
+
+	
+
+	### explanation
@@ -0,0 +1,21 @@
+import streamlit as st
+
+import data
+
+
+def render():
+	st.title('Background Information')
+	st.caption('The following introduction is an excerpt from the World Happiness Report official website, to view their full documentation, visit the site https://worldhappiness.report/')
+	st.markdown('The year 2022 marks the 10th anniversary of the World Happiness Report, which uses global survey data to report how people evaluate their own lives in more than 150 countries worldwide. The World Happiness Report 2022 reveals a bright light in dark times. The pandemic brought not only pain and suffering but also an increase in social support and benevolence. As we battle the ills of disease and war, it is essential to remember the universal desire for happiness and the capacity of individuals to rally to each other’s support in times of great need.')
+	st.markdown('The World Happiness Report, and much of the growing international interest in happiness,  exists thanks to Bhutan. They sponsored Resolution 65/309, "Happiness: Towards a holistic approach to development," adopted by the General Assembly of the United Nations on 19 July 2011, inviting national governments to \"give more importance to happiness and well-being in determining how to achieve and measure social and economic development.\"')
+	st.markdown('On 2 April 2012, chaired by Prime Minister Jigmi Y. Thinley and Jeffrey D. Sachs, the first World Happiness Report was presented to review evidence from the emerging science of happiness for the \'Defining a New Economic Paradigm: The Report of the High-Level Meeting on Well-being and Happiness.\' On 28 June 2012, the United Nations General Assembly adopted Resolution 66/281, proclaiming 20 March International Day of Happiness to be observed annually. The World Happiness Report is now released every year around March 20th as part of the International Day of Happiness celebration.')
+	st.markdown('''### Original Datasets''')
+	st.markdown('This main dataset consists of data collected on various different attributes of world happiness from 2005 to 2020. It contains 1948 rows and 11 columns, including the country name, year, and allotted statistics. Notice that there are some null values from certain countries in certain years.')
+	st.caption('Click on the expand key to zoom in')
+	happiness = data.report()
+	st.write(happiness)
+	st.markdown('This second dataset is based on a similar report on world happiness in 2021. It has 20 columns and more predictors than the previous dataset, some of these variables will be later dropped in the data cleaning stage in order for the two tables to merge effectively.')
+	st.caption('Click on the expand key to zoom in')
+	happiness_2021 = data.report_2021()
+	st.write(happiness_2021)
+	st.markdown('But before we conduct any analytical operations, we need to clean the data to ensure that our analysis is holistic and accurate.')
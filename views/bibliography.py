@@ -0,0 +1,10 @@
+import streamlit as st
+
+
+def render():
+	st.title('Referenced Sources')
+	st.markdown('##### Original Datasets')
+	st.markdown('- “Read the Reports.” Read the Reports, https://worldhappiness.report/archive/')
+	st.markdown('- Singh, Ajaypal. “World Happiness Report 2021.” Kaggle, 22 Mar. 2021, https://www.kaggle.com/datasets/ajaypalsinghlo/world-happiness-report-2021')
+	st.markdown('##### Other Resources')
+	st.markdown('- “Changing World Happiness.” Changing World Happiness, https://worldhappiness.report/ed/2019/changing-world-happiness/')
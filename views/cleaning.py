@@ -0,0 +1,36 @@
+import streamlit as st
+from annotated_text import annotated_text
+
+import data
+
+
+def render():
+	st.title('Data Cleaning')
+	st.markdown('In this process, the two datasets will be combined into one complete table to conduct analysis. In order to achieve this, incorrectly formatted data will be fixed and irrelevant data will be removed. Through this process, the data is ensured to be correct, consistent, and usable.')
+	annotated_text('Firstly, excessive columns that the two datasets do not share in common such as',("Positive affect", '', "#F0F3F4  "),'and ',("Negative affect", '', "#F0F3F4  "),'are dropped.')
+	code = '''happiness_revised = happiness.loc[happiness['Country name'].isin(happiness_2021['Country name'])].copy()
+happiness_revised.drop(['Positive affect','Negative affect'],axis = 1,inplace=True)'''
+	st.code(code, language = 'python')
+	st.markdown('Notice that though the two datasets share many columns that measure the same variables, the naming of the columns is different. So then some columns of the 2021 dataset are renamed to match the main dataset in order to successfully combine the two later.')
+	code2 = '''happiness_2021.rename({'Ladder score':'Life Ladder',
+                       'Logged GDP per capita':'Log GDP per capita',
+                       'Healthy life expectancy':'Healthy life expectancy at birth'},
+                       axis=1,inplace=True)'''
+	st.code(code2, language = 'python')
+	annotated_text('In the 2021 dataset the column',("year", '', "#F0F3F4  "),'is not present. So a year column is added and assigned to 2021 for it to combine with the main dataset.')
+	code3 = '''happiness_2021['year'] = 2021
+happiness_2021 = happiness_2021[list(happiness_revised.columns) + ['Regional indicator']]'''
+	st.code(code3, language = 'python')
+	st.markdown('After these arrangements, the revised datasets are concatenated to form one complete data table. However, it is not quite finished yet.')
+	code4 = '''merged_table = pd.concat([happiness_revised,happiness_2021])'''
+	st.code(code4, language = 'python')
+	annotated_text('Last but not least, a region column is added so that analysis can be done in comparison of different regions. A ', ("Regional indicator", '', "#F0F3F4  "),'column can be found in the original 2021 dataset. The data in that column is used to create a dictionary that assigns each country with its region. The new column ', ("Region", '', "#F0F3F4  "),'is then made in the concatenated dataset using the dictionary to finally complete this process.')
+	code5 = '''region_dict = {k:v for k,v in zip(happiness_2021['Country name'],happiness_2021['Regional indicator'])}
+merged_table['Region'] = merged_table['Country name'].replace(region_dict)
+merged_table.drop('Regional indicator',axis = 1,inplace = True)
+merged_table'''
+	st.code(code5, language = 'python')
+	st.caption('Click on the expand key to zoom in')
+	merged_table = data.merged_table()
+	st.write(merged_table)
+	st.markdown('Since we have the cleaned and completed data, we can start by taking a closer look into it and getting to know it better.')
@@ -0,0 +1,21 @@
+import streamlit as st
+from streamlit_lottie import st_lottie
+
+import assets
+
+
+def render():
+	st.title('Conclusion')
+	lottie_coding = assets.lottie('conclusion')
+	if lottie_coding is not None:
+		st_lottie(
+			lottie_coding,
+			speed=1,
+			reverse=False,
+			loop=True,
+			quality="low", # medium ; high
+			height=None,
+			width=600,
+			key=None,
+			)
+	st.markdown('As the society progresses onwards with the constant development of technological advancements, the environment, privileges, and infrastructures available for citizens and the overall standard of living are also gradually rising. Through the analysis of the data, we can see that most of the happiness factors have an increasing trend in proportion to time on a global level. Though the recent pandemic has caused some degree of decline in the originally rising pattern, it does not make a significant impact on the general trend. And in the foreseeable future, it is speculated that the drop in happiness score will recover.')
@@ -0,0 +1,44 @@
+import plotly.express as px
+import streamlit as st
+
+import data
+import memo
+import pipeline
+import profiling
+import stats
+
+
+def render():
+	memo.begin_rerun('Exploratory Analysis')
+	st.title('Exploratory Analysis')
+	st.markdown('Before analyzing specific regions and countries, it helps to get an overview of the whole dataset: how the happiness factors relate to one another, how they are distributed in each region and year, and how they have been changing over time.')
+	merged_table = data.merged_table()
+	version = pipeline.version()
+	statistics = stats.statistics(merged_table)
+
+	st.subheader('Correlation between happiness factors')
+	st.markdown('Each cell shows the correlation coefficient between two factors, computed over every country and year in which both were recorded. Values close to 1 mean that the two factors tend to rise together, values close to -1 mean that one tends to fall as the other rises.')
+	profiling.plotly_chart(st, memo.chart('correlation heatmap', (version,),
+		lambda: px.imshow(statistics.correlations.round(2), zmin = -1, zmax = 1,
+			color_continuous_scale = px.colors.sequential.RdBu, height = 600, width = 800)))
+
+	st.subheader('Descriptive statistics')
+	factor = st.selectbox('Select the happiness factor you would like to describe', pipeline.FACTORS)
+	col1, col2 = st.columns(2)
+	col1.markdown('###### By region')
+	col1.dataframe(statistics.by_region.xs(factor, level = 'factor').round(3))
+	col2.markdown('###### By year')
+	col2.dataframe(statistics.by_year.xs(factor, level = 'factor').round(3))
+
+	st.subheader('Year-over-year change')
+	st.markdown('The average change of the selected factor from one year to the next for the countries of each region. Bars above zero mean that the region improved on average compared with the previous year.')
+	yoy = statistics.yoy_by_region[factor].reset_index()
+	profiling.plotly_chart(st, memo.chart('year-over-year', (factor, version),
+		lambda: px.bar(yoy, x = 'year', y = factor, color = 'Region', barmode = 'group',
+			height = 500, width = 1100)))
+
+	st.subheader('Rolling trends')
+	trends = statistics.trends['rolling'][factor].reset_index()
+	st.markdown('Regional averages of the selected factor smoothed over a three-year window, which hides the noise of single years and shows the direction each region is heading in.')
+	profiling.plotly_chart(st, memo.chart('rolling trends', (factor, version),
+		lambda: px.line(trends, x = 'year', y = factor, color = 'Region', height = 500, width = 1100)))
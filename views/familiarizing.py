@@ -0,0 +1,55 @@
+import streamlit as st
+from annotated_text import annotated_text
+
+import data
+import profiling
+import summary
+
+
+def render():
+	st.title('Familiarizing with Data')
+	st.markdown('''### Representation of Regions''')
+	st.markdown('The following sunburst chart helps visualize the proportion of representation from each region in the dataset. Bear in mind that the total number of countries from different regions varies. This chart provides a sense of which countries are included, and how much they contributed to the data.')
+	st.caption('Click on any sector to focus on its attributed region and zoom in to get a closer look at the representation of the countries within. Click again on the center core of the plot to zoom back out.')
+	merged_table = data.merged_table()
+	sunburst = summary.sunburst_figure(summary.regional_cube(), 'Life Ladder', height = 800)
+	profiling.plotly_chart(st, sunburst)
+	st.markdown('''### Columns Description''')
+	st.markdown('Understanding each of the variables that the data is measuring is also crucial to analysis.')
+	st.caption('Click on the expand key to zoom in')
+	st.write(merged_table)
+	annotated_text(("Country name", '', "#F0F3F4  "),": name of the country")
+	annotated_text('')
+	annotated_text(("year", '', "#F0F3F4  "),": the year during which the data was collected")
+	annotated_text('')
+	annotated_text(("Life Ladder", '', "#F0F3F4  "),": the national average of responses to the self-evaluation of the status of the respondent's life on a “ladder” scale ranging from 0 to 10, where 0 means the worst possible life and 10 the best possible life.")
+	st.caption('Drag the slider to assess your own "life ladder" value')
+	ll = st.slider('Evaluate your current life status: 0 being the worst possible life, 10 being the best possible life', value = 5, min_value = 0, max_value = 10, step = 1)
+	st.write('Life ladder:', ll)
+	annotated_text('')
+	annotated_text(("Log GDP per capita", '', "#F0F3F4  "),": the result of taking the natural log of the Gross Domestic Product per person on a national scale")
+	annotated_text('')
+	annotated_text(("Social support", '', "#F0F3F4  "),": the national average of the binary responses (either 0 or 1) to the Gallup World Poll (GWP) question “If you were in trouble, do you have relatives or friends you can count on to help you whenever you need them, or not?”")
+	st.caption('Drag the slider to assess your own "social support" value')
+	ss = st.slider('If you were in trouble, do you have relatives or friends you can count on to help you: 0 being no, 1 being yes', value = 0, min_value = 0, max_value = 1, step = 1)
+	st.write('Social support:', ss)
+	annotated_text('')
+	annotated_text(("Healthy life expectancy at birth", '', "#F0F3F4  "),":  the average number of years that a person can expect to live in full health by taking into account years lived in less than full health due to disease and/or injury.")
+	annotated_text('')
+	annotated_text(("Freedom to make life choices", '', "#F0F3F4  "),": the national average of binary responses to the GWP question “Are you satisfied or dissatisfied with your freedom to choose what you do with your life?”")
+	st.caption('Drag the slider to assess your own "freedom to make life choices" value')
+	fc = st.slider('Are you satisfied or dissatisfied with your freedom to choose what you do with your life: 0 being dissatisfied, 1 being satisfied', value = 0, min_value = 0, max_value = 1, step = 1)
+	st.write('Freedom to make life choices:', fc)
+	annotated_text('')
+	annotated_text(("Generosity", '', "#F0F3F4  "),": the residual of regressing the national average of GWP responses to the question “Have you donated money to a charity in the past month?” on GDP per capita.")
+	annotated_text('')
+	annotated_text(("Perceptions of corruption", '', "#F0F3F4  "),": the average of binary answers to two GWP questions: “Is corruption widespread throughout the government or not?” and “Is corruption widespread within businesses or not?” Where data for government corruption are missing, the perception of business corruption is used as the overall corruption-perception measure.")
+	st.caption('Drag the sliders to assess your own "perceptions of corruption" value')
+	pc1 = st.slider('Is corruption widespread throughout the government: 0 being no, 1 being yes', value = 0, min_value = 0, max_value = 1, step = 1)
+	pc2 = st.slider('Is corruption widespread within businesses: 0 being no, 1 being yes', value = 0, min_value = 0, max_value = 1, step = 1)
+	st.write('Perceptions of corruption:', (pc1+pc2)/2)
+	annotated_text('')
+	annotated_text(("Region", '', "#F0F3F4  "),": the region to which the country belongs to")
+	st.markdown('')
+	st.markdown('')
+	st.markdown('Now that we have a more concrete understanding of the data, we can start conducting analysis.')